@@ -1,16 +1,11 @@
-import asyncio
-import os
-
-from dotenv import load_dotenv
 
+from rice_agents._env import get_env
+from rice_agents._runner import run
 from rice_agents.agents.base import Agent
 from rice_agents.containers.base import Container
 from rice_agents.llms.gemini_provider import GeminiProvider
 from rice_agents.tools.base import tool
 
-# Load environment variables
-load_dotenv()
-
 
 # 1. Define a tool
 @tool("get_stock_price")
@@ -22,7 +17,7 @@ def get_stock_price(ticker: str) -> str:
 
 
 async def main():
-    api_key = os.getenv("GOOGLE_API_KEY")
+    api_key = get_env().get("GOOGLE_API_KEY")
     if not api_key:
         print("Please set GOOGLE_API_KEY in .env")
         return
@@ -47,4 +42,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,60 +1,85 @@
 import asyncio
+import hashlib
 import os
 import shutil
 
-from dotenv import load_dotenv
-
+from rice_agents._env import get_env
+from rice_agents._runner import run
 from rice_agents.agents.base import Agent
 from rice_agents.containers.base import Container
 from rice_agents.llms.gemini_provider import GeminiProvider
-from rice_agents.memory.vector_store import ChromaDBStore
-
-load_dotenv()
+from rice_agents.memory.sqlite_vec_store import SqliteVecStore
 
 
 async def main():
-    api_key = os.getenv("GOOGLE_API_KEY")
+    api_key = get_env().get("GOOGLE_API_KEY")
     if not api_key:
         print("Please set GOOGLE_API_KEY in .env")
         return
 
-    # Clean up previous db for this example
-    if os.path.exists("./example_memory_db"):
-        shutil.rmtree("./example_memory_db")
-
-    # 1. Setup Memory
-    print("Initializing Memory...")
-    memory = ChromaDBStore(path="./example_memory_db")
-
     # Add some facts to memory
     facts = [
         "My favorite food is sushi.",
         "I have a pet cat named Luna.",
         "I live in a yellow house on Elm Street.",
     ]
-    memory.add_texts(facts)
-    print("Memory populated.")
+
+    # Skip teardown + re-embedding if the existing store was populated
+    # from exactly these facts (manifest holds their content hash).
+    db_dir = "./example_memory_db"
+    manifest_path = os.path.join(db_dir, ".manifest")
+    facts_key = hashlib.sha256("\n".join(facts).encode()).hexdigest()
+
+    populated = False
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            populated = f.read().strip() == facts_key
+    if not populated and os.path.exists(db_dir):
+        shutil.rmtree(db_dir)
+
+    # 1. Setup Memory
+    # sqlite-vec gives indexed KNN search, so retrieval stays fast even if
+    # the fact count grows into the thousands.
+    print("Initializing Memory...")
+    memory = SqliteVecStore(path=os.path.join(db_dir, "memory.db"))
+
+    if populated:
+        print("Memory already populated (manifest matches); skipping re-embed.")
+    else:
+        memory.add_texts(facts)
+        with open(manifest_path, "w") as f:
+            f.write(facts_key)
+        print("Memory populated.")
 
     # 2. Create Agent with Memory
     llm = GeminiProvider(model="gemini-3-flash-preview", api_key=api_key)
 
     container = Container("PersonalContainer")
-    agent = Agent(
-        name="PersonalBot",
-        llm=llm,
-        memory=memory,
-        system_prompt="You are a personal assistant. Use your memory to answer questions about the user.",
-        container=container,
-    )
 
     # 3. Run - The agent should auto-retrieve relevant facts
+    # The questions are independent, so submit both at once and let the
+    # RAG lookups + LLM calls overlap instead of awaiting sequentially.
+    # Each question gets its own Agent: run() mutates history, so two
+    # concurrent runs on one instance would interleave their turns.
     questions = ["What is my pet's name?", "Where do I live?"]
+    agents = [
+        Agent(
+            name="PersonalBot",
+            llm=llm,
+            memory=memory,
+            system_prompt="You are a personal assistant. Use your memory to answer questions about the user.",
+            container=container,
+        )
+        for _ in questions
+    ]
 
-    for q in questions:
+    responses = await asyncio.gather(
+        *[agent.run(q) for agent, q in zip(agents, questions, strict=True)]
+    )
+    for q, response in zip(questions, responses, strict=True):
         print(f"\nUser: {q}")
-        response = await agent.run(q)
         print(f"Agent: {response}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
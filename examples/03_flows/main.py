@@ -1,18 +1,14 @@
-import asyncio
-import os
-
-from dotenv import load_dotenv
 
+from rice_agents._env import get_env
+from rice_agents._runner import run
 from rice_agents.agents.base import Agent
 from rice_agents.containers.base import Container
 from rice_agents.llms.gemini_provider import GeminiProvider
 from rice_agents.orchestration.flows import ParallelFlow, SequentialFlow
 
-load_dotenv()
-
 
 async def main():
-    api_key = os.getenv("GOOGLE_API_KEY")
+    api_key = get_env().get("GOOGLE_API_KEY")
     if not api_key:
         print("Please set GOOGLE_API_KEY in .env")
         return
@@ -70,4 +66,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
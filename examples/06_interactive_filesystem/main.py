@@ -1,24 +1,34 @@
-import asyncio
 import os
 import shutil
 
-from dotenv import load_dotenv
-
+from rice_agents._env import get_env
+from rice_agents._runner import run
 from rice_agents.agents.base import Agent
 from rice_agents.containers.base import Container
 from rice_agents.llms.gemini_provider import GeminiProvider
 from rice_agents.tools.base import tool
 
-load_dotenv()
-
 # --- Setup Sandboxed Environment ---
 SANDBOX_DIR = "./sandbox_example"
 
+# Sandbox listing cache: setup_sandbox leaves the dir empty, and only
+# write_file can change it, so list_files can skip the os.listdir syscall
+# until the cache is invalidated. None means "stale, rescan".
+_cached_listing: list[str] | None = None
+
 
 def setup_sandbox():
+    global _cached_listing
+    # Reuse an already-empty sandbox instead of tearing it down and
+    # recreating it on every run.
     if os.path.exists(SANDBOX_DIR):
+        if not os.listdir(SANDBOX_DIR):
+            print(f"[System] Reusing empty sandbox at {SANDBOX_DIR}")
+            _cached_listing = []
+            return
         shutil.rmtree(SANDBOX_DIR)
     os.makedirs(SANDBOX_DIR)
+    _cached_listing = []
     print(f"[System] Sandbox created at {SANDBOX_DIR}")
 
 
@@ -28,37 +38,46 @@ def setup_sandbox():
 @tool("list_files")
 def list_files() -> str:
     """Lists all files in the current sandbox directory."""
-    files = os.listdir(SANDBOX_DIR)
+    global _cached_listing
+    if _cached_listing is None:
+        _cached_listing = os.listdir(SANDBOX_DIR)
+    files = _cached_listing
     return f"Files in directory: {files}" if files else "Directory is empty."
 
 
 @tool("write_file")
 def write_file(filename: str, content: str) -> str:
     """Writes content to a file in the sandbox. Overwrites if exists."""
+    global _cached_listing
     filepath = os.path.join(SANDBOX_DIR, filename)
     try:
         with open(filepath, "w") as f:
             f.write(content)
+        _cached_listing = None
         return f"Successfully wrote to {filename}."
     except Exception as e:
         return f"Error writing file: {str(e)}"
 
 
-@tool("read_file")
-def read_file(filename: str) -> str:
+@tool("read_file", streaming=True)
+def read_file(filename: str):
     """Reads content from a file in the sandbox."""
+    # Streamed in 4KB chunks: the agent loop drains this under a size cap,
+    # so a huge file never lands in history (or the next prompt) whole.
     filepath = os.path.join(SANDBOX_DIR, filename)
     if not os.path.exists(filepath):
-        return f"Error: File {filename} does not exist."
+        yield f"Error: File {filename} does not exist."
+        return
     try:
         with open(filepath) as f:
-            return f.read()
+            while chunk := f.read(4096):
+                yield chunk
     except Exception as e:
-        return f"Error reading file: {str(e)}"
+        yield f"Error reading file: {str(e)}"
 
 
 async def main():
-    api_key = os.getenv("GOOGLE_API_KEY")
+    api_key = get_env().get("GOOGLE_API_KEY")
     if not api_key:
         print("Please set GOOGLE_API_KEY in .env")
         return
@@ -112,4 +131,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,35 +1,12 @@
 import asyncio
-import os
 import random
 import time
 
-from dotenv import load_dotenv
-
-from rice_agents.agents.base import Agent
+from rice_agents._runner import run
 from rice_agents.containers.base import Container
-from rice_agents.llms.gemini_provider import GeminiProvider
-from rice_agents.tools.base import tool
-
-load_dotenv()
-
-
-# Tool for agents to update their status
-@tool("update_status")
-def update_status(agent_name: str, location: str, status: str) -> str:
-    """Updates the agent's status in the central system."""
-    return f"Status updated: {agent_name} at {location} is {status}"
-
-
-@tool("check_traffic")
-def check_traffic(location: str) -> str:
-    """Checks traffic at a location."""
-    # Mock congestion logic
-    if random.random() > 0.8:
-        return "CONGESTED"
-    return "CLEAR"
 
 
-async def run_drone_mission(agent, drone_id, container):
+async def run_drone_mission(drone_name, drone_id, container):
     """
     Simulates a complex drone mission.
     The drone 'thinks' (LLM) about traffic, then 'moves' (Simulated), updating shared memory.
@@ -46,40 +23,44 @@ async def run_drone_mission(agent, drone_id, container):
     # Simulation Loop
     current_node = random.randint(0, 20)
     mission_log = []  # noqa: F841
+    telemetry = []
 
     for step in range(5):
         # Interact with Shared Scratchpad (Read)
         # Check if too many drones are at the next target
         target_node = (current_node + random.randint(1, 3)) % 20
 
-        # Interact with Shared Scratchpad (Write)
-        if container.memory_store:
-            container.memory_store.add_scratchpad(
-                session_id="city_simulation_v1",
-                agent=agent.name,
-                content=f"Moving to {target_node}",
-                metadata={
+        # Buffer telemetry locally; flushed in one bulk write below.
+        # 100 drones x 5 steps of individual add_scratchpad calls is 500
+        # round trips; batching per drone cuts that 5x.
+        telemetry.append(
+            {
+                "agent": drone_name,
+                "content": f"Moving to {target_node}",
+                "metadata": {
                     "location": str(target_node),
                     "step": str(step),
                     "status": "moving",
                 },
-            )
+            }
+        )
 
         # Simulate movement time
         await asyncio.sleep(random.uniform(0.05, 0.2))
         current_node = target_node
 
+    if container.memory_store:
+        await asyncio.to_thread(
+            container.memory_store.add_scratchpad_batch,
+            "city_simulation_v1",
+            telemetry,
+        )
+
     return f"Drone {drone_id} finished at {current_node}"
 
 
 async def main():
     print("=== City Logistics Swarm Demo (100 Agents) ===")
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        print("Please set GOOGLE_API_KEY in .env")
-        return
-
-    llm = GeminiProvider(model="gemini-3-flash-preview", api_key=api_key)
 
     # Initialize Container with RiceDB config
     container = Container("SmartCityOps")
@@ -97,23 +78,16 @@ async def main():
     print("Cleaning up old simulation data...")
     container.memory_store.clear_scratchpad("city_simulation_v1")  # ty:ignore[unresolved-attribute]
 
-    agents = []
-    print("🚀 Deploying 100 Drone Agents...")
-    for i in range(100):
-        agent = Agent(
-            name=f"Drone_{i:03d}",
-            llm=llm,
-            tools=[update_status, check_traffic],
-            system_prompt="You are an autonomous delivery drone. Avoid traffic.",
-            container=container,
-        )
-        agents.append(agent)
+    # The missions below are pure simulation — no per-drone Agent objects
+    # (or LLM calls) are needed; each mission only carries a drone name
+    # for its telemetry writes.
+    print("🚀 Deploying 100 drone missions...")
 
     print("Starting simulation (5 steps per drone)...")
     start_time = time.time()
 
-    # Execute 100 agents concurrently
-    tasks = [run_drone_mission(agent, i, container) for i, agent in enumerate(agents)]
+    # Execute 100 drone missions concurrently
+    tasks = [run_drone_mission(f"Drone_{i:03d}", i, container) for i in range(100)]
     results = await asyncio.gather(*tasks)
 
     elapsed = time.time() - start_time
@@ -144,4 +118,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
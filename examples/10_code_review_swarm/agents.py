@@ -1,26 +1,81 @@
+import functools
 import json
-import os
-from typing import List
+import re
 
-from db_handler import SwarmRiceDBHandler
+from db_handler import SwarmRiceDBHandler, entry_ts
 from schema import Finding, Task, TaskPayload
 
+from rice_agents._env import get_env
 from rice_agents.agents.base import Agent
 from rice_agents.llms.gemini_provider import GeminiProvider
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Initialize Provider globally for this example or per agent
+# orjson decodes 2-5x faster than the stdlib; poll cycles decode every
+# unseen scratchpad payload, so this is the hottest JSON path here.
+_json_loads = orjson.loads if orjson else json.loads
+
+# Extracts the JSON array from an LLM response (which may be wrapped in
+# markdown fences or chatter) in one scan, replacing a chain of full-string
+# replace() rewrites plus a find/rfind double scan.
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+
+# One provider shared by every wrapper in this example: all agents talk to
+# the same model, so there's no reason to construct a provider (and its
+# request-config state) per agent. The underlying genai.Client/connection
+# pool is already shared per API key inside GeminiProvider.
+@functools.lru_cache(maxsize=1)
 def get_llm():
-    api_key = os.getenv("GOOGLE_API_KEY")
+    api_key = get_env().get("GOOGLE_API_KEY")
     return GeminiProvider(model="gemini-3-flash-preview", api_key=api_key)
 
 
+# Scratchpad entries are immutable once written (updates are new entries),
+# but every poll cycle re-sees the same contents. Memoizing the parse keyed
+# by the raw payload turns O(workers x entries) JSON decodes + validations
+# per cycle into one per unique entry.
+_parse_cache = {}
+
+
+def parse_entry(content: str):
+    """Parse a scratchpad payload into a Task or Finding (None otherwise)."""
+    if content not in _parse_cache:
+        try:
+            data = _json_loads(content)
+            if "payload" in data:
+                parsed = Task.model_validate(data)
+            elif "severity" in data:
+                parsed = Finding.model_validate(data)
+            else:
+                parsed = None
+        except Exception:
+            parsed = None
+        _parse_cache[content] = parsed
+
+    parsed = _parse_cache[content]
+    # Tasks get mutated by claimers (status transitions); hand out a copy
+    # so the cached instance stays pristine. model_copy skips validation.
+    if isinstance(parsed, Task):
+        return parsed.model_copy()
+    return parsed
+
+
 class Orchestrator:
     def __init__(self, db: SwarmRiceDBHandler):
         self.name = "Orchestrator"
         self.db = db
         self.round = 1
         self.max_rounds = 2
+        # Incremental monitor state: entries already folded into these are
+        # never re-fetched or re-parsed; the cursor is the newest entry
+        # timestamp seen so far.
+        self._cursor = 0.0
+        self._tasks: dict = {}
+        self._findings: dict = {}
 
     def log(self, msg):
         print(f"[{self.name}] {msg}")
@@ -65,24 +120,34 @@ class Orchestrator:
             content=task.model_dump_json(),
             related_file="job_board",
             ttl=3600 * 24,
+            kind="task",
         )
 
     def monitor(self) -> bool:
-        entries = self.db.get_scratchpad_entries()
-        tasks = {}
-        findings = []
-
-        for entry in entries:
-            try:
-                content = entry.get("content", "")
-                data = json.loads(content)
-                if "payload" in data:
-                    t = Task(**data)
-                    tasks[t.id] = t
-                elif "severity" in data:
-                    findings.append(Finding(**data))
-            except:
-                continue
+        # Two kind-filtered reads instead of one fetch-everything scan,
+        # bounded by a high-watermark cursor so each cycle folds in only
+        # entries newer than the last one seen (O(delta), not O(history)).
+        task_entries = self.db.get_scratchpad_entries(
+            filter_dict={"kind": "task"}, since_ts=self._cursor
+        )
+        finding_entries = self.db.get_scratchpad_entries(
+            filter_dict={"kind": "finding"}, since_ts=self._cursor
+        )
+
+        # Status updates are appended as new task entries; last write wins.
+        for entry in task_entries:
+            parsed = parse_entry(entry.get("content", ""))
+            if isinstance(parsed, Task):
+                self._tasks[parsed.id] = parsed
+            self._cursor = max(self._cursor, entry_ts(entry))
+        for entry in finding_entries:
+            parsed = parse_entry(entry.get("content", ""))
+            if isinstance(parsed, Finding):
+                self._findings[parsed.id] = parsed
+            self._cursor = max(self._cursor, entry_ts(entry))
+
+        tasks = self._tasks
+        findings = list(self._findings.values())
 
         pending = [t for t in tasks.values() if t.status in ("pending", "in_progress")]
 
@@ -97,7 +162,7 @@ class Orchestrator:
 
         return True
 
-    def analyze_findings_and_retask(self, findings: List[Finding]) -> int:
+    def analyze_findings_and_retask(self, findings: list[Finding]) -> int:
         count = 0
         for f in findings:
             if f.severity == "critical" and "auth" in f.description.lower():
@@ -132,47 +197,60 @@ class WorkerWrapper:
     def log(self, msg):
         print(f"[{self.name}] {msg}")
 
-    async def poll_and_work(self) -> bool:
-        entries = self.db.get_scratchpad_entries()
-        tasks = {}
-        for entry in entries:
-            try:
-                data = json.loads(entry.get("content", ""))
-                if "payload" in data:
-                    t = Task(**data)
-                    tasks[t.id] = t
-            except:
-                pass
-
-        my_tasks = [
-            t
-            for t in tasks.values()
-            if t.status == "pending"
-            and (t.assigned_to == self.role or t.assigned_to is None)
-        ]
+    async def poll_and_work(self, preloaded_tasks: list[Task] | None = None) -> bool:
+        # The main loop usually fetches the board once per cycle and fans
+        # it out (preloaded_tasks); the self-fetch path remains for
+        # standalone use.
+        if preloaded_tasks is not None:
+            my_tasks = [
+                t
+                for t in preloaded_tasks
+                if t.status == "pending"
+                and (t.assigned_to == self.role or t.assigned_to is None)
+            ]
+        else:
+            # Kind filter runs server-side; the status dedup below stays
+            # local: a task's latest status lives in its most recent entry.
+            entries = await self.db.aget_scratchpad_entries(
+                filter_dict={"kind": "task"}
+            )
+            tasks = {}
+            for entry in entries:
+                parsed = parse_entry(entry.get("content", ""))
+                if isinstance(parsed, Task):
+                    tasks[parsed.id] = parsed
+            my_tasks = [
+                t
+                for t in tasks.values()
+                if t.status == "pending"
+                and (t.assigned_to == self.role or t.assigned_to is None)
+            ]
+
         if not my_tasks:
             return False
 
         task = my_tasks[0]
-        self.claim_task(task)
+        await self.claim_task(task)
         await self.execute_task_async(task)
         return True
 
-    def claim_task(self, task: Task):
+    async def claim_task(self, task: Task):
         task.status = "in_progress"
-        self.db.write_scratchpad_entry(
-            self.name, task.model_dump_json(), "job_board_update"
+        await self.db.awrite_scratchpad_entry(
+            self.name, task.model_dump_json(), "job_board_update", kind="task"
         )
 
     async def execute_task_async(self, task: Task):
         # We need async here because Agent.run is async
         self.log(f"Executing task {task.id}")
 
-        # 1. Search Code
-        results = self.db.get_code_files(query=task.payload.focus_query, limit=5)
+        # 1. Search Code (contents pre-truncated to the context budget)
+        results = await self.db.aget_code_files(
+            query=task.payload.focus_query, limit=5, text_chars=2000
+        )
         context_str = "\n".join(
             [
-                f"File: {r.get('metadata', {}).get('file_path')}\n{r.get('metadata', {}).get('text', '')[:2000]}"
+                f"File: {r.get('metadata', {}).get('file_path')}\n{r.get('metadata', {}).get('text', '')}"
                 for r in results
             ]
         )
@@ -189,13 +267,9 @@ class WorkerWrapper:
 
         try:
             response = await self.agent.run(prompt)
-            # Cleanup json
-            json_str = response.replace("```json", "").replace("```", "").strip()
-            # Handle possible intro text if model chats
-            if "[" in json_str:
-                json_str = json_str[json_str.find("[") : json_str.rfind("]") + 1]
-
-            findings_data = json.loads(json_str)
+            # Extract the JSON array (ignores fences/intro text around it)
+            match = _JSON_ARRAY_RE.search(response)
+            findings_data = _json_loads(match.group(0)) if match else []
 
             if isinstance(findings_data, list):
                 for item in findings_data:
@@ -210,16 +284,16 @@ class WorkerWrapper:
                         line=str(item.get("line")),
                         recommendation=item.get("recommendation"),
                     )
-                    self.db.write_scratchpad_entry(
-                        self.name, f.model_dump_json(), "finding"
+                    await self.db.awrite_scratchpad_entry(
+                        self.name, f.model_dump_json(), "finding", kind="finding"
                     )
                     self.log(f"Reported finding: {f.description[:50]}...")
         except Exception as e:
             self.log(f"Error: {e}")
 
         task.status = "completed"
-        self.db.write_scratchpad_entry(
-            self.name, task.model_dump_json(), "job_board_update"
+        await self.db.awrite_scratchpad_entry(
+            self.name, task.model_dump_json(), "job_board_update", kind="task"
         )
 
     # Sync wrapper removed, use execute_task_async
@@ -247,21 +321,19 @@ class SynthesizerWrapper:
 
     async def run(self):
         print(f"[{self.name}] Gathering reports...")
-        entries = self.db.get_scratchpad_entries()
+        # Only findings cross the wire; tasks and job-board updates are
+        # filtered out server-side via the kind tag.
+        entries = await self.db.aget_scratchpad_entries(
+            filter_dict={"kind": "finding"}
+        )
         if not entries:
-            return
-
-        reports = ""
-        for entry in entries:
-            content = entry.get("content", "")
-            # Filter for Findings
-            if "severity" in content:
-                reports += f"\nFinding: {content}\n"
-
-        if not reports:
             print("No findings to synthesize.")
             return
 
+        reports = "\n".join(
+            f"\nFinding: {entry.get('content', '')}" for entry in entries
+        )
+
         prompt = f"""
         Synthesize these code review findings into a Markdown report.
         Findings:
@@ -1,12 +1,11 @@
+import asyncio
+import hashlib
+import logging
 import os
 import time
 import uuid
-import json
-from typing import List, Dict, Optional, Any
-import logging
-from dotenv import load_dotenv
 
-load_dotenv()
+from rice_agents._env import get_env
 
 try:
     from ricedb import RiceDBClient
@@ -16,6 +15,32 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def entry_ts(entry: dict) -> float:
+    """Best-effort timestamp of a scratchpad entry (0.0 when unstamped)."""
+    ts = (
+        entry.get("timestamp")
+        or entry.get("created_at")
+        or entry.get("metadata", {}).get("timestamp")
+    )
+    try:
+        return float(ts)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _stable_id(s: str) -> int:
+    """
+    Stable 64-bit node ID for a string key.
+
+    Python's hash() is salted per process, so hash-derived IDs change
+    between runs (breaking re-ingest dedup), and the old % 10000000
+    truncation hit birthday collisions at a few thousand paths. A BLAKE2b
+    digest is reproducible and keeps the full 62-bit positive range.
+    """
+    digest = hashlib.blake2b(s.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & ((1 << 62) - 1)
+
+
 class SwarmRiceDBHandler:
     def __init__(
         self,
@@ -28,10 +53,10 @@ class SwarmRiceDBHandler:
             raise ImportError("RiceDB not installed")
 
         # Remote connection settings from environment
-        HOST = os.environ.get("RICEDB_HOST", host)
-        PORT = int(os.environ.get("RICEDB_PORT", "80"))
-        PASSWORD = os.environ.get("RICEDB_PASSWORD", password)
-        SSL = os.environ.get("RICEDB_SSL", "false").lower() == "true"
+        HOST = get_env().get("RICEDB_HOST", host)
+        PORT = int(get_env().get("RICEDB_PORT", "80"))
+        PASSWORD = get_env().get("RICEDB_PASSWORD", password)
+        SSL = get_env().get("RICEDB_SSL", "false").lower() == "true"
 
         # Initialize client (auto-detects transport)
         self.client = RiceDBClient(HOST, port=PORT)
@@ -51,39 +76,83 @@ class SwarmRiceDBHandler:
         self.user_id = user_id
         self.session_id = f"review-session-{uuid.uuid4().hex[:8]}"
 
-    def insert_code_file(self, file_path: str, content: str, project_root: str):
+        # Secondary index over the entry tags used by the pollers, so the
+        # kind-filtered reads below return O(matching) rows.
+        create_index = getattr(self.client, "create_index", None)
+        if create_index:
+            try:
+                create_index(["kind", "assigned_to", "status"])
+            except Exception as e:
+                logger.warning(f"Failed to create scratchpad index: {e}")
+
+    def _code_file_doc(self, file_path: str, content: str, project_root: str) -> dict:
         rel_path = os.path.relpath(file_path, project_root)
-        # Deterministic node ID from path hash
-        node_id = abs(hash(rel_path)) % 10000000
-
-        metadata = {
-            "type": "code_file",
-            "file_path": rel_path,
-            "extension": os.path.splitext(rel_path)[1],
-            "timestamp": time.time(),
+        return {
+            # Deterministic node ID from path hash
+            "id": _stable_id(rel_path),
             "text": content,
+            "metadata": {
+                "type": "code_file",
+                "file_path": rel_path,
+                "extension": os.path.splitext(rel_path)[1],
+                "timestamp": time.time(),
+                "text": content,
+            },
         }
 
+    def insert_code_file(self, file_path: str, content: str, project_root: str):
+        doc = self._code_file_doc(file_path, content, project_root)
         self.client.insert(
-            node_id=node_id,
-            text=content,
-            metadata=metadata,
+            node_id=doc["id"],
+            text=doc["text"],
+            metadata=doc["metadata"],
             user_id=self.user_id,
         )
 
+    def insert_code_files_batch(self, files: list[tuple], project_root: str):
+        """
+        Insert many (file_path, content) pairs in one batch_insert call,
+        paying a single round trip/commit instead of one per file.
+        """
+        if not files:
+            return
+
+        batch_data = [
+            self._code_file_doc(file_path, content, project_root)
+            for file_path, content in files
+        ]
+
+        batch_insert = getattr(self.client, "batch_insert", None)
+        if batch_insert:
+            batch_insert(batch_data, user_id=self.user_id)
+        else:
+            for doc in batch_data:
+                self.client.insert(
+                    node_id=doc["id"],
+                    text=doc["text"],
+                    metadata=doc["metadata"],
+                    user_id=self.user_id,
+                )
+
     def write_scratchpad_entry(
         self,
         agent_name: str,
         content: str,
-        related_file: Optional[str] = None,
-        ttl: Optional[int] = None,
+        related_file: str | None = None,
+        ttl: int | None = None,
+        kind: str | None = None,
     ):
         """
         Agents use this to write their findings/thoughts using the native Agent Memory.
+
+        `kind` tags the entry ("task" / "finding") so pollers can filter
+        server-side instead of fetching and parsing every entry.
         """
         meta = {"type": "scratchpad_entry"}
         if related_file:
             meta["related_file"] = related_file
+        if kind:
+            meta["kind"] = kind
 
         # Use native memory if available
         if hasattr(self.client, "memory"):
@@ -96,7 +165,7 @@ class SwarmRiceDBHandler:
             )
         else:
             # Fallback
-            node_id = abs(hash(f"{agent_name}_{time.time()}")) % 10000000
+            node_id = _stable_id(f"{agent_name}_{time.time()}")
             meta["agent"] = agent_name
             meta["timestamp"] = time.time()
             meta["text"] = content
@@ -108,31 +177,62 @@ class SwarmRiceDBHandler:
                 user_id=self.user_id,
             )
 
-    def get_scratchpad_entries(self, filter_dict: Optional[Dict] = None) -> List[Dict]:
+    def get_scratchpad_entries(
+        self, filter_dict: dict | None = None, since_ts: float | None = None
+    ) -> list[dict]:
         """
         Retrieve scratchpad entries from native memory.
+
+        `since_ts` returns only entries stamped after the given time, so
+        incremental pollers fetch O(new) instead of the whole history.
         """
         if hasattr(self.client, "memory"):
-            return self.client.memory.get(
+            entries = self.client.memory.get(
                 session_id=self.session_id, limit=100, filter=filter_dict
             )
+            if since_ts:
+                # Watermark applied client-side until the RiceDB client
+                # grows a server-side range filter on timestamps.
+                entries = [e for e in entries if entry_ts(e) > since_ts]
+            return entries
         return []
 
+    # Async wrappers: the underlying client is synchronous, so these hop to
+    # a worker thread. Workers awaiting them overlap their DB round trips
+    # instead of stalling the shared event loop one RPC at a time.
+
+    async def aget_scratchpad_entries(
+        self, filter_dict: dict | None = None, since_ts: float | None = None
+    ) -> list[dict]:
+        return await asyncio.to_thread(
+            self.get_scratchpad_entries, filter_dict, since_ts
+        )
+
+    async def awrite_scratchpad_entry(self, *args, **kwargs):
+        return await asyncio.to_thread(self.write_scratchpad_entry, *args, **kwargs)
+
+    async def aget_code_files(
+        self, query: str = "", limit: int = 10, text_chars: int | None = None
+    ) -> list[dict]:
+        return await asyncio.to_thread(self.get_code_files, query, limit, text_chars)
+
     def link_files(
         self, source_path: str, relation: str, target_path: str, project_root: str
     ):
         rel_source = os.path.relpath(source_path, project_root)
         rel_target = os.path.relpath(target_path, project_root)
 
-        source_id = abs(hash(rel_source)) % 10000000
-        target_id = abs(hash(rel_target)) % 10000000
+        source_id = _stable_id(rel_source)
+        target_id = _stable_id(rel_target)
 
         try:
             self.client.link(source_id, relation, target_id)
         except Exception as e:
             logger.warning(f"Failed to link {rel_source} -> {rel_target}: {e}")
 
-    def get_code_files(self, query: str = "", limit: int = 10) -> List[Dict]:
+    def get_code_files(
+        self, query: str = "", limit: int = 10, text_chars: int | None = None
+    ) -> list[dict]:
         if not query:
             query = "code"
 
@@ -145,5 +245,14 @@ class SwarmRiceDBHandler:
         # This avoids finding unrelated data from other examples (like Quantum Physics facts)
         filtered = [
             r for r in results if r.get("metadata", {}).get("type") == "code_file"
-        ]
-        return filtered[:limit]
+        ][:limit]
+
+        # Truncate file contents as early as possible so callers building
+        # prompt context never hold full file bodies they'd slice anyway.
+        if text_chars is not None:
+            for r in filtered:
+                meta = r.get("metadata", {})
+                text = meta.get("text")
+                if text and len(text) > text_chars:
+                    meta["text"] = text[:text_chars]
+        return filtered
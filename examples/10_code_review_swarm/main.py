@@ -1,14 +1,51 @@
 import asyncio
 import os
 
-from agents import IngestionAgent, Orchestrator, SynthesizerWrapper, WorkerWrapper
+from agents import (
+    IngestionAgent,
+    Orchestrator,
+    SynthesizerWrapper,
+    Task,
+    WorkerWrapper,
+    parse_entry,
+)
 from db_handler import SwarmRiceDBHandler
-from dotenv import load_dotenv
 
-load_dotenv()
+from rice_agents._runner import run
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
 
 TARGET_DIR = "dummy_codebase"
 
+CODE_EXTS = (".py", ".js", ".ts", ".html")
+SKIP_DIRS = {".git", "node_modules", "__pycache__"}
+
+
+def iter_code_files(root: str):
+    """
+    Yield code file paths under root using os.scandir.
+    DirEntry caches type info from the directory read, so this avoids a
+    stat per file, filters extensions before any further work, and prunes
+    vendored/VCS directories without descending into them.
+    """
+    for entry in os.scandir(root):
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in SKIP_DIRS:
+                yield from iter_code_files(entry.path)
+        elif entry.is_file(follow_symlinks=False) and entry.name.endswith(CODE_EXTS):
+            yield entry.path
+
+
+async def _read_file(file_path: str) -> str:
+    if aiofiles:
+        async with aiofiles.open(file_path, "r") as f:
+            return await f.read()
+    # Fallback: blocking read in a worker thread
+    return await asyncio.to_thread(lambda: open(file_path).read())
+
 
 async def ingest_codebase(db):
     ingest_agent = IngestionAgent()
@@ -16,23 +53,26 @@ async def ingest_codebase(db):
 
     project_root = os.path.abspath(TARGET_DIR)
 
-    for root, dirs, files in os.walk(project_root):
-        for file in files:
-            file_path = os.path.join(root, file)
-            # Skip non-code
-            if not file.endswith((".py", ".js", ".ts", ".html")):
-                continue
+    file_paths = list(iter_code_files(project_root))
 
-            with open(file_path, "r") as f:
-                content = f.read()
+    # Read + analyze files concurrently: both stages are I/O-bound (disk,
+    # then an LLM round trip per file), so a bounded gather turns N serial
+    # analysis calls into ceil(N/16) waves.
+    sem = asyncio.Semaphore(16)
 
-            # Pre-process
-            print(f"Analyzing {file}...")
+    async def _one(file_path):
+        async with sem:
+            content = await _read_file(file_path)
+            print(f"Analyzing {os.path.basename(file_path)}...")
             analysis = await ingest_agent.process_file(file_path, content)
             indexed_text = f"--- AI ANALYSIS ---\n{analysis}\n\n--- CODE ---\n{content}"
+            return file_path, indexed_text
+
+    analyzed = await asyncio.gather(*[_one(fp) for fp in file_paths])
 
-            db.insert_code_file(file_path, indexed_text, project_root)
-            print(f"Ingested: {file}")
+    # One bulk insert for the whole codebase instead of a round trip per file
+    await asyncio.to_thread(db.insert_code_files_batch, analyzed, project_root)
+    print(f"Ingested {len(analyzed)} files.")
 
 
 async def run_swarm():
@@ -69,13 +109,24 @@ async def run_swarm():
         print(f"\n--- Cycle {iteration} ---")
         work_done = False
 
-        # Workers poll
+        # One shared board fetch per cycle, fanned out to all workers —
+        # four identical polls of the same entries collapse into one.
+        entries = await db.aget_scratchpad_entries(filter_dict={"kind": "task"})
+        board = {}
+        for entry in entries:
+            parsed = parse_entry(entry.get("content", ""))
+            if isinstance(parsed, Task):
+                board[parsed.id] = parsed
+
+        # Workers pick from the shared view; a claim flips the shared
+        # task's status, so later workers in the cycle skip it.
         for worker in workers:
-            if await worker.poll_and_work():
+            mine = [t for t in board.values() if t.status == "pending"]
+            if await worker.poll_and_work(mine):
                 work_done = True
 
-        # Orchestrator
-        if not orchestrator.monitor() and not work_done:
+        # Orchestrator (network reads run off-loop)
+        if not await asyncio.to_thread(orchestrator.monitor) and not work_done:
             print("Orchestrator signals completion.")
             active = False
 
@@ -102,4 +153,4 @@ if __name__ == "__main__":
         with open(f"{TARGET_DIR}/heavy.py", "w") as f:
             f.write("def process():\n    for i in range(1000000):\n        print(i)")
 
-    asyncio.run(run_swarm())
+    run(run_swarm())
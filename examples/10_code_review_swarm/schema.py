@@ -1,6 +1,7 @@
 import time
 import uuid
-from typing import List, Optional, Dict, Any, Literal
+from typing import List, Literal, Optional
+
 from pydantic import BaseModel, Field
 
 
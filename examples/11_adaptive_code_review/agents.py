@@ -1,30 +1,176 @@
+import asyncio
+import functools
 import json
-import time
-import os
-from typing import List, Dict, Optional, Any
+import re
+
 from db_handler import SwarmRiceDBHandler
-from schema import Task, Finding, TaskPayload
+from schema import Finding, Task, TaskPayload
+
+from rice_agents._env import get_env
 from rice_agents.agents.base import Agent
-from rice_agents.llms.gemini_provider import GeminiProvider
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson else json.loads
+
+# Extracts the JSON array from an LLM response (which may be wrapped in
+# markdown fences or chatter) in one scan, replacing a chain of full-string
+# replace() rewrites plus a find/rfind double scan.
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
 
+
+class _JSONArrayStreamParser:
+    """
+    Incrementally extracts completed top-level objects from a JSON array
+    arriving in chunks (markdown fences and chatter around the array are
+    skipped). Lets each finding be persisted as soon as its object closes
+    instead of waiting for the full response to finish streaming.
+    """
+
+    def __init__(self):
+        self._in_array = False
+        self._in_string = False
+        self._escape = False
+        self._depth = 0
+        self._obj = None
+
+    def feed(self, chunk: str) -> list:
+        items = []
+        for ch in chunk:
+            if not self._in_array:
+                if ch == "[":
+                    self._in_array = True
+                continue
+            if self._obj is None:
+                if ch == "{":
+                    self._obj = ["{"]
+                    self._depth = 1
+                elif ch == "]":
+                    self._in_array = False
+                continue
+            self._obj.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    text = "".join(self._obj)
+                    self._obj = None
+                    try:
+                        items.append(_json_loads(text))
+                    except Exception:
+                        continue
+        return items
+
+
+def decode_task(content: str) -> Task:
+    """
+    Rebuild a Task from a job-board payload we wrote ourselves.
+
+    model_construct skips per-field validation, which is safe here: these
+    payloads only ever come from Task.model_dump_json() in this process,
+    so revalidating them on every poll tick is pure overhead.
+    """
+    data = _json_loads(content)
+    data["payload"] = TaskPayload.model_construct(**data["payload"])
+    return Task.model_construct(**data)
+
+
+@functools.lru_cache(maxsize=1)
 def get_llm():
-    api_key = os.getenv("GOOGLE_API_KEY")
+    # Imported here (and memoized) so the google-genai stack loads once,
+    # on first use, rather than at module import — every DynamicWorker
+    # constructed by main.py funnels through this same provider.
+    from rice_agents.llms.gemini_provider import GeminiProvider
+
+    api_key = get_env().get("GOOGLE_API_KEY")
     return GeminiProvider(model="gemini-3-flash-preview", api_key=api_key)
 
 
 class IngestionAgent:
     def __init__(self):
-        self.agent = Agent(name="Ingestion", llm=get_llm())
+        self.llm = get_llm()
+        self.agent = Agent(name="Ingestion", llm=self.llm)
 
-    async def process_file(self, file_path: str, content: str) -> str:
-        prompt = f"""
+    @staticmethod
+    def _build_prompt(file_path: str, content: str) -> str:
+        return f"""
         Analyze code file: {file_path}
         Content: {content[:4000]}
         Output: 1-sentence summary, Key symbols, Tech stack.
         Format: Text.
         """
-        return await self.agent.run(prompt)
+
+    async def process_file(self, file_path: str, content: str) -> str:
+        return await self.agent.run(self._build_prompt(file_path, content))
+
+    async def _process_concurrently(
+        self, items: list[tuple], max_workers: int = 5
+    ) -> list[str]:
+        """
+        Interactive-API path: overlap the per-file LLM waits under a
+        semaphore (bounded to respect rate limits). Each call gets its own
+        Agent because an Agent's history isn't safe for concurrent runs.
+        """
+        sem = asyncio.Semaphore(max_workers)
+
+        async def _one(file_path, content):
+            async with sem:
+                agent = Agent(name="Ingestion", llm=self.llm)
+                return await agent.run(self._build_prompt(file_path, content))
+
+        return list(await asyncio.gather(*[_one(fp, c) for fp, c in items]))
+
+    async def process_files(self, items: list[tuple]) -> list[str]:
+        """
+        Analyze many (file_path, content) pairs in one Gemini Batch API
+        job: a single submit + poll replaces one HTTP round trip per file,
+        and batch-tier requests are billed at half rate. Falls back to
+        per-file calls if the client lacks batch support or the job fails.
+        """
+        batches = getattr(self.llm.client.aio, "batches", None)
+        if batches is None or len(items) <= 1:
+            return await self._process_concurrently(items)
+
+        requests = [
+            {
+                "contents": [
+                    {
+                        "role": "user",
+                        "parts": [{"text": self._build_prompt(fp, c)}],
+                    }
+                ]
+            }
+            for fp, c in items
+        ]
+
+        try:
+            job = await batches.create(model=self.llm.model, src=requests)
+            while job.state.name in ("JOB_STATE_PENDING", "JOB_STATE_RUNNING"):
+                await asyncio.sleep(5)
+                job = await batches.get(name=job.name)
+            if job.state.name != "JOB_STATE_SUCCEEDED":
+                raise RuntimeError(f"batch job ended in {job.state.name}")
+            return [
+                (r.response.text or "") if r.response else ""
+                for r in job.dest.inlined_responses
+            ]
+        except Exception as e:
+            print(f"[Ingestion] Batch API unavailable ({e}); using per-file calls.")
+            return await self._process_concurrently(items)
 
 
 class AdaptiveOrchestrator:
@@ -32,8 +178,12 @@ class AdaptiveOrchestrator:
         self.name = "AdaptiveOrchestrator"
         self.db = db
         self.agent = Agent(name="Orchestrator", llm=get_llm())
+        # Local task index keyed by id; updated on post and folded from
+        # job-board deltas in monitor(), so the pending check is O(tasks)
+        # over a small dict instead of a parse of every scratchpad entry.
+        self.pending_tasks: dict[str, Task] = {}
 
-    async def analyze_and_plan(self) -> List[Dict]:
+    async def analyze_and_plan(self) -> list[dict]:
         print(f"[{self.name}] Analyzing codebase to form a dynamic plan...")
 
         # Get overview of files
@@ -63,11 +213,11 @@ class AdaptiveOrchestrator:
 
         try:
             response = await self.agent.run(prompt)
-            json_str = response.replace("```json", "").replace("```", "").strip()
-            if "[" in json_str:
-                json_str = json_str[json_str.find("[") : json_str.rfind("]") + 1]
-            plan = json.loads(json_str)
-            return plan
+            match = _JSON_ARRAY_RE.search(response)
+            plan = _json_loads(match.group(0)) if match else []
+            if plan:
+                return plan
+            raise ValueError("no JSON array in response")
         except Exception as e:
             print(f"[{self.name}] Plan generation failed: {e}")
             # Fallback plan
@@ -79,27 +229,41 @@ class AdaptiveOrchestrator:
                 }
             ]
 
-    def post_task(self, role: str, instruction: str, query: str):
-        task = Task(
+    def create_task(self, role: str, instruction: str, query: str) -> Task:
+        """Build a Task for local queue dispatch (no scratchpad write)."""
+        return Task(
             type="adaptive_review",
             assigned_to=role,
             payload=TaskPayload(focus_query=query, instruction=instruction),
         )
-        self.db.write_scratchpad_entry(self.name, task.model_dump_json(), "job_board")
+
+    def post_task(self, role: str, instruction: str, query: str):
+        task = self.create_task(role, instruction, query)
+        self.db.write_scratchpad_entry(
+            self.name,
+            task.model_dump_json(),
+            "job_board",
+            kind="task",
+            assigned_to=role,
+            task_id=task.id,
+            status=task.status,
+        )
+        self.pending_tasks[task.id] = task
         print(f"[{self.name}] Posted task for {role}: {instruction}")
 
     def monitor(self) -> bool:
-        entries = self.db.get_scratchpad_entries()
-        for entry in entries:
+        # Server-side kind filter: only task entries cross the wire.
+        # Status updates are appended as new entries; last write wins.
+        for entry in self.db.get_tasks():
             try:
-                data = json.loads(entry.get("content", ""))
-                if "payload" in data:
-                    t = Task(**data)
-                    if t.status in ("pending", "in_progress"):
-                        return True
-            except:
+                t = decode_task(entry.get("content", ""))
+            except Exception:
                 continue
-        return False
+            if t.status in ("pending", "in_progress"):
+                self.pending_tasks[t.id] = t
+            else:
+                self.pending_tasks.pop(t.id, None)
+        return bool(self.pending_tasks)
 
 
 class DynamicWorker:
@@ -113,31 +277,68 @@ class DynamicWorker:
             system_prompt=f"You are a {role}. Review code context provided and output findings in strictly JSON format.",
         )
 
+    async def run_queue(self, queue: asyncio.Queue, all_queues: dict[str, asyncio.Queue]):
+        """
+        Drain this role's queue, stealing from other roles' queues once it
+        empties. All tasks are enqueued before the workers start, so an
+        all-empty sweep means the run is done and the worker exits —
+        no polling, no tick sleeps.
+        """
+        while True:
+            task = self._next_task(queue, all_queues)
+            if task is None:
+                return
+            await self.execute_task(task)
+
+    def _next_task(self, queue: asyncio.Queue, all_queues: dict[str, asyncio.Queue]):
+        try:
+            return queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        # Work-stealing: idle roles pick up whatever is left elsewhere
+        for other in all_queues.values():
+            if other is queue:
+                continue
+            try:
+                return other.get_nowait()
+            except asyncio.QueueEmpty:
+                continue
+        return None
+
     async def poll_and_work(self) -> bool:
-        entries = self.db.get_scratchpad_entries()
-        tasks = []
-        for entry in entries:
+        # Only this role's task entries are fetched (kind + assignee filter
+        # run server-side); the status dedup stays local because a task's
+        # latest status lives in its most recent entry.
+        tasks: dict[str, Task] = {}
+        for entry in self.db.get_tasks(assigned_to=self.role):
             try:
-                data = json.loads(entry.get("content", ""))
-                if "payload" in data:
-                    t = Task(**data)
-                    if t.status == "pending" and t.assigned_to == self.role:
-                        tasks.append(t)
-            except:
-                pass
-
-        if not tasks:
-            return False
-
-        task = tasks[0]
-        self.claim_task(task)
-        await self.execute_task(task)
-        return True
+                t = decode_task(entry.get("content", ""))
+            except Exception:
+                continue
+            tasks[t.id] = t
+
+        pending = [t for t in tasks.values() if t.status == "pending"]
+
+        for task in pending:
+            # CAS claim first: if another worker with this role won the
+            # race this tick, move on instead of double-executing.
+            if not self.db.claim_task(task.id, self.name):
+                continue
+            self.claim_task(task)
+            await self.execute_task(task)
+            return True
+        return False
 
     def claim_task(self, task):
         task.status = "in_progress"
         self.db.write_scratchpad_entry(
-            self.name, task.model_dump_json(), "job_board_update"
+            self.name,
+            task.model_dump_json(),
+            "job_board_update",
+            kind="task",
+            assigned_to=task.assigned_to,
+            task_id=task.id,
+            status=task.status,
         )
 
     async def execute_task(self, task):
@@ -163,15 +364,12 @@ class DynamicWorker:
         Example: [{{"severity": "high", "description": "Issue", "file": "file.py", "line": "1", "recommendation": "Fix"}}]
         """
 
+        # Stream the response and persist each finding the moment its JSON
+        # object closes, overlapping token generation with the DB writes.
+        parser = _JSONArrayStreamParser()
         try:
-            response = await self.agent.run(prompt)
-            json_str = response.replace("```json", "").replace("```", "").strip()
-            if "[" in json_str:
-                json_str = json_str[json_str.find("[") : json_str.rfind("]") + 1]
-
-            findings = json.loads(json_str)
-            if isinstance(findings, list):
-                for item in findings:
+            async for chunk in self.agent.run_stream(prompt):
+                for item in parser.feed(chunk):
                     f = Finding(
                         task_id=task.id,
                         type="bug",
@@ -182,7 +380,7 @@ class DynamicWorker:
                         recommendation=item.get("recommendation"),
                     )
                     self.db.write_scratchpad_entry(
-                        self.name, f.model_dump_json(), "finding"
+                        self.name, f.model_dump_json(), "finding", kind="finding"
                     )
                     print(f"[{self.name}] Found: {f.description[:50]}...")
         except Exception as e:
@@ -190,7 +388,13 @@ class DynamicWorker:
 
         task.status = "completed"
         self.db.write_scratchpad_entry(
-            self.name, task.model_dump_json(), "job_board_update"
+            self.name,
+            task.model_dump_json(),
+            "job_board_update",
+            kind="task",
+            assigned_to=task.assigned_to,
+            task_id=task.id,
+            status=task.status,
         )
 
 
@@ -202,17 +406,18 @@ class SynthesizerWrapper:
 
     async def run(self):
         print(f"[{self.name}] Synthesizing report...")
-        entries = self.db.get_scratchpad_entries()
-        reports = ""
-        for entry in entries:
-            content = entry.get("content", "")
-            if "severity" in content:
-                reports += f"\nFinding: {content}\n"
-
-        if not reports:
+        # Findings are tagged at write time, so the filter runs in the
+        # store instead of substring-scanning every entry's payload here;
+        # the single join replaces quadratic += string building.
+        entries = self.db.get_scratchpad_entries(filter_dict={"kind": "finding"})
+        if not entries:
             print("No findings to synthesize.")
             return
 
+        reports = "".join(
+            f"\nFinding: {entry.get('content', '')}\n" for entry in entries
+        )
+
         prompt = f"""
         Create a Final Code Review Report based on:
         {reports}
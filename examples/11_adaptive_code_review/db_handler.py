@@ -1,21 +1,26 @@
+import hashlib
+import logging
 import os
 import time
 import uuid
-import json
-from typing import List, Dict, Optional, Any
-import logging
-from dotenv import load_dotenv
 
-load_dotenv()
-
-try:
-    from ricedb import RiceDBClient
-except ImportError:
-    RiceDBClient = None
+from rice_agents._env import get_env
 
 logger = logging.getLogger(__name__)
 
 
+def _node_id(s: str) -> int:
+    """
+    Stable 64-bit node ID for a string key.
+
+    Python's hash() is salted per process, so hash-derived IDs change
+    between runs (breaking re-ingest dedup), and the old % 10000000
+    truncation hit birthday collisions at a few thousand paths. A BLAKE2b
+    digest is reproducible and keeps the full 64-bit range.
+    """
+    return int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+
+
 class SwarmRiceDBHandler:
     def __init__(
         self,
@@ -24,14 +29,19 @@ class SwarmRiceDBHandler:
         username: str = "admin",
         password: str = "password123",
     ):
-        if RiceDBClient is None:
-            raise ImportError("RiceDB not installed")
+        # Imported lazily so `import db_handler` stays cheap; the client
+        # (and, below, the sentence-transformers stack) only load when a
+        # handler is actually constructed.
+        try:
+            from ricedb import RiceDBClient
+        except ImportError:
+            raise ImportError("RiceDB not installed") from None
 
         # Remote connection settings
-        HOST = os.environ.get("RICEDB_HOST", "")
-        PORT = int(os.environ.get("RICEDB_PORT", "80"))
-        PASSWORD = os.environ.get("RICEDB_PASSWORD", "")
-        SSL = os.environ.get("RICEDB_SSL", "false").lower() == "true"
+        HOST = get_env().get("RICEDB_HOST", "")
+        PORT = int(get_env().get("RICEDB_PORT", "80"))
+        PASSWORD = get_env().get("RICEDB_PASSWORD", "")
+        SSL = get_env().get("RICEDB_SSL", "false").lower() == "true"
 
         # Initialize client (auto-detects transport)
         self.client = RiceDBClient(HOST, port=PORT)
@@ -51,39 +61,142 @@ class SwarmRiceDBHandler:
         self.user_id = user_id
         self.session_id = f"review-session-{uuid.uuid4().hex[:8]}"
 
-    def insert_code_file(self, file_path: str, content: str, project_root: str):
+        # Built lazily on first access (see embedding_generator below):
+        # constructing the SentenceTransformers generator drags in
+        # torch/transformers, which shouldn't happen before the first embed.
+        self._embedding_generator = None
+        self._embedder_loaded = False
+
+    @property
+    def embedding_generator(self):
+        """
+        Client-side embedding generator behind the process-wide embedding
+        cache: the same query strings (every worker searches its focus
+        query, and "code" is the default) and repeated file contents get
+        one MiniLM forward pass instead of one per call. None when the
+        ricedb embeddings extra is not installed.
+        """
+        if not self._embedder_loaded:
+            self._embedder_loaded = True
+            try:
+                from ricedb import SentenceTransformersEmbeddingGenerator
+            except ImportError:
+                return None
+            # Deferred with the generator import above: the wrapper module
+            # is cheap, but importing it at module scope next to get_env
+            # defeats the point of this lazy block.
+            from rice_agents.memory._embed_cache import CachedEmbeddingGenerator
+
+            self._embedding_generator = CachedEmbeddingGenerator(
+                SentenceTransformersEmbeddingGenerator()
+            )
+        return self._embedding_generator
+
+    def _code_file_doc(self, file_path: str, content: str, project_root: str) -> dict:
         rel_path = os.path.relpath(file_path, project_root)
-        # Deterministic node ID from path hash
-        node_id = abs(hash(rel_path)) % 10000000
-
-        metadata = {
-            "type": "code_file",
-            "file_path": rel_path,
-            "extension": os.path.splitext(rel_path)[1],
-            "timestamp": time.time(),
+        return {
+            # Deterministic node ID from path hash
+            "id": _node_id(rel_path),
             "text": content,
+            "metadata": {
+                "type": "code_file",
+                "file_path": rel_path,
+                "extension": os.path.splitext(rel_path)[1],
+                "timestamp": time.time(),
+                "text": content,
+            },
         }
 
-        self.client.insert(
-            node_id=node_id,
-            text=content,
-            metadata=metadata,
-            user_id=self.user_id,
-        )
+    def insert_code_file(self, file_path: str, content: str, project_root: str):
+        doc = self._code_file_doc(file_path, content, project_root)
+        node_id, content, metadata = doc["id"], doc["text"], doc["metadata"]
+
+        insert_text = getattr(self.client, "insert_text", None)
+        if insert_text and self.embedding_generator:
+            insert_text(
+                node_id=node_id,
+                text=content,
+                metadata=metadata,
+                user_id=self.user_id,
+                embedding_generator=self.embedding_generator,
+            )
+        else:
+            self.client.insert(
+                node_id=node_id,
+                text=content,
+                metadata=metadata,
+                user_id=self.user_id,
+            )
+
+    def insert_code_files_batch(self, files: list[tuple], project_root: str):
+        """
+        Insert many (file_path, content) pairs at once: one batched
+        SentenceTransformers forward pass for all bodies (amortizing model
+        launch overhead that a per-file encode pays N times) and one
+        batch_insert round trip with the precomputed vectors.
+        """
+        if not files:
+            return
+
+        docs = [
+            self._code_file_doc(file_path, content, project_root)
+            for file_path, content in files
+        ]
+
+        vectors = None
+        if self.embedding_generator:
+            texts = [doc["text"] for doc in docs]
+            generate_batch = getattr(
+                self.embedding_generator, "generate_embeddings", None
+            )
+            if generate_batch:
+                vectors = generate_batch(texts)
+            else:
+                vectors = [
+                    self.embedding_generator.generate_embedding(t) for t in texts
+                ]
+
+        batch_insert = getattr(self.client, "batch_insert", None)
+        if batch_insert:
+            if vectors is not None:
+                for doc, vector in zip(docs, vectors, strict=True):
+                    doc["vector"] = vector
+            batch_insert(docs, user_id=self.user_id)
+        else:
+            for file_path, content in files:
+                self.insert_code_file(file_path, content, project_root)
 
     def write_scratchpad_entry(
         self,
         agent_name: str,
         content: str,
-        related_file: Optional[str] = None,
-        ttl: Optional[int] = None,
+        related_file: str | None = None,
+        ttl: int | None = None,
+        kind: str | None = None,
+        assigned_to: str | None = None,
+        task_id: str | None = None,
+        status: str | None = None,
     ):
         """
         Agents use this to write their findings/thoughts using the native Agent Memory.
+
+        `kind` ("task" / "finding") and `assigned_to` are stamped into the
+        metadata so pollers can filter server-side instead of fetching and
+        JSON-parsing every entry on every tick. Task entries also carry
+        `task_id` and `status` — claim_task's compare-and-set matches on
+        exactly those two fields.
         """
         meta = {"type": "scratchpad_entry"}
         if related_file:
             meta["related_file"] = related_file
+        if kind:
+            meta["kind"] = kind
+        if assigned_to:
+            meta["assigned_to"] = assigned_to
+        if task_id:
+            meta["task_id"] = task_id
+        if status:
+            meta["status"] = status
 
         # Use native memory if available
         if hasattr(self.client, "memory"):
@@ -96,7 +209,7 @@ class SwarmRiceDBHandler:
             )
         else:
             # Fallback
-            node_id = abs(hash(f"{agent_name}_{time.time()}")) % 10000000
+            node_id = _node_id(f"{agent_name}_{time.time()}")
             meta["agent"] = agent_name
             meta["timestamp"] = time.time()
             meta["text"] = content
@@ -108,7 +221,7 @@ class SwarmRiceDBHandler:
                 user_id=self.user_id,
             )
 
-    def get_scratchpad_entries(self, filter_dict: Optional[Dict] = None) -> List[Dict]:
+    def get_scratchpad_entries(self, filter_dict: dict | None = None) -> list[dict]:
         """
         Retrieve scratchpad entries from native memory.
         """
@@ -118,29 +231,79 @@ class SwarmRiceDBHandler:
             )
         return []
 
+    def get_tasks(self, assigned_to: str | None = None) -> list[dict]:
+        """
+        Fetch job-board task entries, filtered server-side by the kind tag
+        (and optionally the assignee, which never changes for a task).
+
+        Status is deliberately not part of the filter: a task's current
+        status lives in its most recent entry, so callers dedup by task id
+        and keep the latest rather than matching stale "pending" rows.
+        """
+        filter_dict: dict = {"kind": "task"}
+        if assigned_to:
+            filter_dict["assigned_to"] = assigned_to
+        return self.get_scratchpad_entries(filter_dict=filter_dict)
+
+    def claim_task(self, task_id: str, worker_name: str) -> bool:
+        """
+        Atomically claim a task: compare-and-set on status=pending, so of
+        two same-role workers polling the same tick only the first claim
+        succeeds and the duplicate LLM call (and its cost/latency) never
+        happens. Returns False when another worker won the race.
+
+        Optimistically returns True when the client has no conditional
+        update — single-poller-per-role deployments are unaffected.
+        """
+        memory = getattr(self.client, "memory", None)
+        update_if = getattr(memory, "update_if", None) if memory else None
+        if update_if is None:
+            return True
+        try:
+            result = update_if(
+                session_id=self.session_id,
+                filter={"task_id": task_id, "status": "pending"},
+                set={"status": "in_progress", "claimed_by": worker_name},
+            )
+            return bool(result)
+        except Exception as e:
+            logger.warning(f"Conditional claim failed for {task_id}: {e}")
+            return True
+
     def link_files(
         self, source_path: str, relation: str, target_path: str, project_root: str
     ):
         rel_source = os.path.relpath(source_path, project_root)
         rel_target = os.path.relpath(target_path, project_root)
 
-        source_id = abs(hash(rel_source)) % 10000000
-        target_id = abs(hash(rel_target)) % 10000000
+        source_id = _node_id(rel_source)
+        target_id = _node_id(rel_target)
 
         try:
             self.client.link(source_id, relation, target_id)
         except Exception as e:
             logger.warning(f"Failed to link {rel_source} -> {rel_target}: {e}")
 
-    def get_code_files(self, query: str = "", limit: int = 10) -> List[Dict]:
+    def get_code_files(self, query: str = "", limit: int = 10) -> list[dict]:
         if not query:
             query = "code"
 
-        results = self.client.search(
-            query=query,
-            k=limit * 5,
-            user_id=self.user_id,
-        )
+        search_text = getattr(self.client, "search_text", None)
+        if search_text and self.embedding_generator:
+            # Query embedded locally through the cache, so repeated focus
+            # queries skip both the forward pass and server-side embedding.
+            results = search_text(
+                query=query,
+                k=limit * 5,
+                user_id=self.user_id,
+                embedding_generator=self.embedding_generator,
+            )
+        else:
+            results = self.client.search(
+                query=query,
+                k=limit * 5,
+                user_id=self.user_id,
+            )
         # Client-side filtering to ensure we only get code files
         # This avoids finding unrelated data from other examples (like Quantum Physics facts)
         filtered = [
@@ -1,5 +1,6 @@
 import asyncio
 import os
+from pathlib import Path
 
 from agents import (
     AdaptiveOrchestrator,
@@ -8,32 +9,59 @@ from agents import (
     SynthesizerWrapper,
 )
 from db_handler import SwarmRiceDBHandler
-from dotenv import load_dotenv
 
-load_dotenv()
+from rice_agents._runner import run
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
 
 TARGET_DIR = "dummy_codebase"
 
+MAX_READ_WORKERS = 5
+
+
+async def _read_file(file_path: str) -> str:
+    if aiofiles:
+        async with aiofiles.open(file_path, "r") as f:
+            return await f.read()
+    # Fallback: blocking read in a worker thread
+    return await asyncio.to_thread(Path(file_path).read_text)
+
 
 async def ingest_codebase(db):
     ingest_agent = IngestionAgent()
     print(f"Starting ingestion of {TARGET_DIR}...")
     project_root = os.path.abspath(TARGET_DIR)
 
+    file_paths = []
     for root, dirs, files in os.walk(project_root):
         for file in files:
-            file_path = os.path.join(root, file)
-            if not file.endswith((".py", ".js", ".ts", ".html")):
-                continue
+            if file.endswith((".py", ".js", ".ts", ".html")):
+                file_paths.append(os.path.join(root, file))
+
+    # Read files concurrently under a bounded semaphore instead of one
+    # blocking open/read at a time on the event loop.
+    sem = asyncio.Semaphore(MAX_READ_WORKERS)
+
+    async def _ingest_one(file_path):
+        async with sem:
+            return file_path, await _read_file(file_path)
 
-            with open(file_path, "r") as f:
-                content = f.read()
+    items = list(await asyncio.gather(*[_ingest_one(fp) for fp in file_paths]))
 
-            print(f"Analyzing {file}...")
-            analysis = await ingest_agent.process_file(file_path, content)
-            indexed_text = f"--- AI ANALYSIS ---\n{analysis}\n\n--- CODE ---\n{content}"
-            db.insert_code_file(file_path, indexed_text, project_root)
-            print(f"Ingested: {file}")
+    # One batch job for the whole codebase instead of a serial await per file
+    print(f"Analyzing {len(items)} files via batch job...")
+    analyses = await ingest_agent.process_files(items)
+
+    analyzed = [
+        (file_path, f"--- AI ANALYSIS ---\n{analysis}\n\n--- CODE ---\n{content}")
+        for (file_path, content), analysis in zip(items, analyses, strict=True)
+    ]
+    # One batched embed + insert for the whole codebase
+    await asyncio.to_thread(db.insert_code_files_batch, analyzed, project_root)
+    print(f"Ingested {len(analyzed)} files.")
 
 
 async def run_swarm():
@@ -54,39 +82,32 @@ async def run_swarm():
         return
 
     print("\n=== Adaptive Plan ===")
-    workers = []
+    # One worker per role: plans can repeat a role, and duplicate workers
+    # would each build an Agent and race on the same assigned_to queue.
+    # Tasks go straight onto per-role asyncio.Queues — the scratchpad is
+    # for findings, not dispatch — so workers never re-poll the store.
+    workers_by_role = {}
+    queues = {}
     for step in plan:
         role = step.get("role", "Worker")
         instr = step.get("instruction", "")
         query = step.get("query", "")
         print(f" - Role: {role}, Task: {instr}")
 
-        # Post task
-        orchestrator.post_task(role, instr, query)
-
-        # Spawn Worker (if not already spawned for this role, or we can have 1 per role)
-        # We will create a worker for each planned item
-        worker = DynamicWorker(role, db)
-        workers.append(worker)
-
-    # 3. Execution Loop
-    active = True
-    iteration = 0
-    max_iterations = 5
-
-    while active and iteration < max_iterations:
-        iteration += 1
-        print(f"\n--- Cycle {iteration} ---")
-        work_done = False
-
-        for worker in workers:
-            if await worker.poll_and_work():
-                work_done = True
-
-        # Monitor (Adaptive might add more tasks in real implementation, here we just check pending)
-        if not orchestrator.monitor() and not work_done:
-            print("All tasks completed.")
-            active = False
+        workers_by_role.setdefault(role, DynamicWorker(role, db))
+        queues.setdefault(role, asyncio.Queue()).put_nowait(
+            orchestrator.create_task(role, instr, query)
+        )
+
+    # 3. Execution: every worker drains its own queue and steals from the
+    # others once empty, so early finishers stay busy until all tasks are
+    # done. Replaces the old poll-every-cycle loop.
+    await asyncio.gather(
+        *(
+            worker.run_queue(queues[role], queues)
+            for role, worker in workers_by_role.items()
+        )
+    )
 
     # 4. Synthesize
     print("\n--- Synthesis Phase ---")
@@ -95,17 +116,23 @@ async def run_swarm():
 
 
 if __name__ == "__main__":
-    if not os.path.exists(TARGET_DIR):
-        os.makedirs(TARGET_DIR)
+    # mkdir(exist_ok=True) and write_text: one syscall path each, no
+    # exists-then-create race
+    root = Path(TARGET_DIR)
+    root.mkdir(parents=True, exist_ok=True)
 
     # Ensure dummy files exist
-    if not os.path.exists(f"{TARGET_DIR}/auth.py"):
-        with open(f"{TARGET_DIR}/auth.py", "w") as f:
-            f.write(
-                "def login(u, p):\n    # TODO: remove hardcoded secret\n    secret = 'my_secret'\n    if p == secret: return True"
-            )
-    if not os.path.exists(f"{TARGET_DIR}/heavy.py"):
-        with open(f"{TARGET_DIR}/heavy.py", "w") as f:
-            f.write("def process():\n    for i in range(1000000):\n        print(i)")
-
-    asyncio.run(run_swarm())
+    auth = root / "auth.py"
+    if not auth.exists():
+        auth.write_text(
+            "def login(u, p):\n    # TODO: remove hardcoded secret\n    secret = 'my_secret'\n    if p == secret: return True",
+            encoding="utf-8",
+        )
+    heavy = root / "heavy.py"
+    if not heavy.exists():
+        heavy.write_text(
+            "def process():\n    for i in range(1000000):\n        print(i)",
+            encoding="utf-8",
+        )
+
+    run(run_swarm())
@@ -1,10 +1,30 @@
+import asyncio
+import functools
 import os
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import numpy as np
 from dotenv import load_dotenv
 from pinecone import Pinecone
 from ricedb import RiceDBClient
 
+try:
+    from pinecone.grpc import PineconeGRPC
+except ImportError:
+    PineconeGRPC = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from ricedb import SentenceTransformersEmbeddingGenerator
+except ImportError:
+    SentenceTransformersEmbeddingGenerator = None
+
 load_dotenv()
 
 # Configuration
@@ -14,24 +34,136 @@ DATASET_SIZE = 1000
 QUERY_COUNT = 20
 
 
+def run_concurrent_queries(run_query, count, max_workers=8):
+    """
+    Fire `count` queries from a thread pool and return (wall_time,
+    per-query latencies). The sequential loops above measure end-to-end
+    RTT; this measures what the server can actually sustain when the
+    network-wait windows overlap.
+    """
+
+    def timed(i):
+        t0 = time.time()
+        run_query(i)
+        return time.time() - t0
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        latencies = list(executor.map(timed, range(count)))
+    return time.time() - start, latencies
+
+
+def run_async_queries(client, queries):
+    """
+    Issue all queries at once over the client's async API (HTTP/2
+    multiplexes them onto one connection, so in-flight requests overlap
+    instead of paying a strict RTT each). Same return shape as
+    run_concurrent_queries.
+    """
+
+    async def _run():
+        async def timed(q):
+            t0 = time.time()
+            await client.asearch(q, user_id=1, k=10)
+            return time.time() - t0
+
+        start = time.time()
+        latencies = await asyncio.gather(*(timed(q) for q in queries))
+        return time.time() - start, list(latencies)
+
+    return asyncio.run(_run())
+
+
+def report_concurrent(label, wall_time, latencies):
+    qps = len(latencies) / wall_time
+    p50, p95 = np.percentile(latencies, [50, 95])
+    print(
+        f"{label} Concurrent QPS: {qps:.1f} "
+        f"(p50 {p50 * 1000:.2f}ms, p95 {p95 * 1000:.2f}ms)"
+    )
+
+
+class ProximityCache:
+    """
+    Query -> results LRU cache for client.search, keyed by embedding
+    proximity. The benchmark's queries are structurally near-identical
+    ("Document {i} about machine learning, ..."), so after the first
+    round trip a query within `tau` cosine similarity of a cached one is
+    answered with one local dot product over the stacked cached vectors.
+    Exact string repeats hit a dict without touching the encoder. The
+    proximity layer needs the ricedb sentence-transformers extra; without
+    it only exact repeats hit.
+    """
+
+    def __init__(self, capacity=256, tau=0.95):
+        self.capacity = capacity
+        self.tau = tau
+        self._entries = OrderedDict()  # query -> (vector, results)
+        self.hits = 0
+        self.misses = 0
+        self._embedder = None
+        if SentenceTransformersEmbeddingGenerator is not None:
+            try:
+                self._embedder = SentenceTransformersEmbeddingGenerator()
+            except Exception:
+                self._embedder = None
+
+    def _embed(self, query):
+        try:
+            vec = np.asarray(
+                self._embedder.generate_embedding(query), dtype=np.float32
+            )
+        except Exception:
+            return None
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def search(self, client, query, **kwargs):
+        entry = self._entries.get(query)
+        if entry is not None:
+            self._entries.move_to_end(query)
+            self.hits += 1
+            return entry[1]
+
+        vec = None
+        if self._embedder is not None:
+            keys = [k for k, (v, _) in self._entries.items() if v is not None]
+            vec = self._embed(query)
+            if vec is not None and keys:
+                sims = np.stack([self._entries[k][0] for k in keys]) @ vec
+                best = int(np.argmax(sims))
+                if sims[best] >= self.tau:
+                    self._entries.move_to_end(keys[best])
+                    self.hits += 1
+                    return self._entries[keys[best]][1]
+
+        self.misses += 1
+        results = client.search(query, **kwargs)
+        self._entries[query] = (vec, results)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return results
+
+
 def generate_dataset(size):
     """Generate dataset with text documents for both RiceDB and Pinecone."""
     print(f"Generating {size} text documents...")
-    dataset = []
-    for i in range(size):
-        dataset.append(
-            {
-                "id": f"doc_{i}",
-                "text": f"Document {i} about machine learning, neural networks, and AI research benchmarks.",
-            }
-        )
-    return dataset
+    return [
+        {
+            "id": f"doc_{i}",
+            "text": f"Document {i} about machine learning, neural networks, and AI research benchmarks.",
+        }
+        for i in range(size)
+    ]
 
 
-def benchmark_ricedb(dataset):
-    """Benchmark RiceDB using text-only inserts (server handles HDC encoding)."""
-    print("\n--- Benchmarking RiceDB ---")
-
+@functools.lru_cache(maxsize=1)
+def get_ricedb_client():
+    """
+    Connect and authenticate once per process. Parameter sweeps rerun the
+    benchmark functions many times; memoizing the client means each extra
+    run skips the TCP/TLS handshake and the login round trip.
+    """
     HOST = os.environ.get("RICEDB_HOST", "grpc.ricedb-test-2.ricedb.tryrice.com")
     PORT = int(os.environ.get("RICEDB_PORT", "80"))
     PASSWORD = os.environ.get("RICEDB_PASSWORD", "ed294b4085f0959974cd6e0ca7dfffbd")
@@ -40,18 +172,43 @@ def benchmark_ricedb(dataset):
     print(f"Connecting to {HOST}:{PORT} (SSL={SSL})...")
     client = RiceDBClient(HOST, port=PORT)
     client.ssl = SSL
+    client.connect()
+    client.login("admin", PASSWORD)
 
-    try:
-        client.connect()
-    except Exception as e:
-        print(f"Failed to connect to RiceDB: {e}")
-        return None, None
+    # Hand the client a faster JSON codec when it accepts one. Metadata
+    # stays as native dicts either way — the client serializes it once at
+    # the wire, and orjson's C encoder cuts that cost per batch_insert.
+    if orjson is not None and hasattr(client, "json_module"):
+        client.json_module = orjson
+    return client
+
+
+@functools.lru_cache(maxsize=1)
+def get_pinecone_client():
+    """
+    One Pinecone client per process, preferring the gRPC transport
+    (multiplexed HTTP/2 streams instead of one HTTPS connection per
+    request). Memoized so repeated benchmark runs skip the discovery
+    calls the constructor makes.
+    """
+    if PineconeGRPC is not None:
+        return PineconeGRPC(api_key=PINECONE_API_KEY)
+    return Pinecone(api_key=PINECONE_API_KEY)
+
+
+@functools.lru_cache(maxsize=1)
+def get_pinecone_index():
+    return get_pinecone_client().Index(INDEX_NAME)
+
+
+def benchmark_ricedb(dataset):
+    """Benchmark RiceDB using text-only inserts (server handles HDC encoding)."""
+    print("\n--- Benchmarking RiceDB ---")
 
-    # Auth
     try:
-        client.login("admin", PASSWORD)
+        client = get_ricedb_client()
     except Exception as e:
-        print(f"Login failed: {e}")
+        print(f"Failed to connect to RiceDB: {e}")
         return None, None
 
     # Ingest using batch_insert (RiceDB handles HDC encoding server-side)
@@ -70,22 +227,34 @@ def benchmark_ricedb(dataset):
             }
         )
 
-    # Batch insert in chunks
+    # Batch insert in chunks, dispatched concurrently: sequential batches
+    # leave the server idle for a full round trip between requests, while
+    # a small thread pool keeps several HTTP/2 streams in flight on the
+    # shared (thread-safe) client.
     BATCH_SIZE = 100
     total_inserted = 0
-    for i in range(0, len(batch_docs), BATCH_SIZE):
-        chunk = batch_docs[i : i + BATCH_SIZE]
-        try:
-            result = client.batch_insert(chunk)
-            count = result.get("count", len(chunk))
-            total_inserted += count
-        except Exception as e:
-            print(f"RiceDB Insert Error in batch {i // BATCH_SIZE + 1}: {e}")
+
+    def insert_chunk(chunk):
+        result = client.batch_insert(chunk)
+        return result.get("count", len(chunk))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(insert_chunk, batch_docs[i : i + BATCH_SIZE])
+            for i in range(0, len(batch_docs), BATCH_SIZE)
+        ]
+        for future in as_completed(futures):
+            try:
+                total_inserted += future.result()
+            except Exception as e:
+                print(f"RiceDB Insert Error: {e}")
 
     ingest_time = time.time() - start_time
     print(f"RiceDB Ingestion Time: {ingest_time:.4f}s ({total_inserted} docs)")
 
-    # Query
+    # Query — uncached: every query goes to the server so the headline
+    # latency numbers measure RiceDB itself and stay comparable to the
+    # Pinecone loop below.
     print(f"Running {QUERY_COUNT} queries...")
     start_time = time.time()
     for i in range(QUERY_COUNT):
@@ -96,6 +265,33 @@ def benchmark_ricedb(dataset):
     print(f"RiceDB Total Query Time: {query_time:.4f}s")
     print(f"RiceDB Avg Latency: {avg_query * 1000:.2f}ms")
 
+    # Separate phase: the same queries through a client-side proximity
+    # cache, reported as its own labeled metric — what an app with a
+    # repetitive query stream would see, not a database comparison.
+    cache = ProximityCache()
+    start_time = time.time()
+    for i in range(QUERY_COUNT):
+        cache.search(client, dataset[i]["text"], user_id=1, k=10)
+    cached_time = time.time() - start_time
+    print(
+        f"RiceDB + ProximityCache (client-side): {cached_time:.4f}s total, "
+        f"{cached_time / QUERY_COUNT * 1000:.2f}ms avg, "
+        f"hits {cache.hits}/{cache.hits + cache.misses}"
+    )
+
+    # Throughput under concurrency: prefer the async search API when the
+    # client exposes one (single multiplexed connection, no thread pool),
+    # otherwise overlap the sync calls from threads.
+    if getattr(client, "asearch", None):
+        wall_time, latencies = run_async_queries(
+            client, [dataset[i]["text"] for i in range(QUERY_COUNT)]
+        )
+    else:
+        wall_time, latencies = run_concurrent_queries(
+            lambda i: client.search(dataset[i]["text"], user_id=1, k=10), QUERY_COUNT
+        )
+    report_concurrent("RiceDB", wall_time, latencies)
+
     return ingest_time, avg_query
 
 
@@ -103,8 +299,7 @@ def benchmark_pinecone(dataset):
     """Benchmark Pinecone using integrated embeddings (text-only, server handles embedding)."""
     print("\n--- Benchmarking Pinecone ---")
     try:
-        pc = Pinecone(api_key=PINECONE_API_KEY)
-        index = pc.Index(INDEX_NAME)
+        index = get_pinecone_index()
     except Exception as e:
         print(f"Pinecone Connection Error: {e}")
         return None, None
@@ -113,14 +308,25 @@ def benchmark_pinecone(dataset):
     print(f"Ingesting {len(dataset)} items (text-only, server handles embedding)...")
     start_time = time.time()
 
-    # Pinecone upsert_records has a batch size limit of 96
+    # Pinecone upsert_records has a batch size limit of 96; batches are
+    # dispatched concurrently like the RiceDB side for a fair comparison
     batch_size = 96
-    for i in range(0, len(dataset), batch_size):
-        batch = dataset[i : i + batch_size]
-        # Use upsert_records for integrated embedding
+
+    def upsert_chunk(batch):
         records = [{"_id": item["id"], "text": item["text"]} for item in batch]
         index.upsert_records(namespace="benchmark", records=records)
 
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(upsert_chunk, dataset[i : i + batch_size])
+            for i in range(0, len(dataset), batch_size)
+        ]
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Pinecone Upsert Error: {e}")
+
     ingest_time = time.time() - start_time
     print(f"Pinecone Ingestion Time: {ingest_time:.4f}s")
 
@@ -137,6 +343,16 @@ def benchmark_pinecone(dataset):
     print(f"Pinecone Total Query Time: {query_time:.4f}s")
     print(f"Pinecone Avg Latency: {avg_query * 1000:.2f}ms")
 
+    # Throughput under concurrency
+    wall_time, latencies = run_concurrent_queries(
+        lambda i: index.search(
+            namespace="benchmark",
+            query={"top_k": 10, "inputs": {"text": dataset[i]["text"]}},
+        ),
+        QUERY_COUNT,
+    )
+    report_concurrent("Pinecone", wall_time, latencies)
+
     return ingest_time, avg_query
 
 
@@ -144,8 +360,7 @@ def main():
     # 1. Verify Pinecone index exists
     print("Checking Pinecone Index...")
     try:
-        pc = Pinecone(api_key=PINECONE_API_KEY)
-        idx_desc = pc.describe_index(INDEX_NAME)
+        idx_desc = get_pinecone_client().describe_index(INDEX_NAME)
         print(
             f"Using Pinecone Index: {INDEX_NAME} (dim={idx_desc.dimension}, model=llama-text-embed-v2)"
         )
@@ -1,5 +1,6 @@
-import os
-import json
+import asyncio
+
+from rice_agents._env import get_env
 from rice_agents.agents.base import Agent
 from rice_agents.llms.gemini_provider import GeminiProvider
 from rice_agents.tools.base import tool
@@ -7,10 +8,43 @@ from rice_agents.tools.base import tool
 
 def get_llm():
     return GeminiProvider(
-        model="gemini-3-flash-preview", api_key=os.getenv("GOOGLE_API_KEY")
+        model="gemini-3-flash-preview", api_key=get_env().get("GOOGLE_API_KEY")
     )
 
 
+# Caps concurrent Gemini requests across all leads: with the campaign
+# loop gather-parallelized, an unbounded fan-out trips provider-side
+# rate limits (429s) whose retries end up serializing everything anyway.
+_gemini_sem = asyncio.Semaphore(16)
+
+
+# Prompt templates built once at import. Besides skipping per-call
+# f-string assembly, the flush-left bodies drop the indentation
+# whitespace the old inline strings sent to the model on every request.
+_STRATEGY_TMPL = """\
+Lead: {name}, {role} at {company}.
+Industry: {industry}
+Interests: {interests}
+Research: {research}
+
+Relevant Product Knowledge:
+{context}
+
+Develop a sales angle. Output JSON: {{ "angle": "...", "key_value_props": [...] }}"""
+
+_OUTREACH_TMPL = """\
+Draft a cold email to {name}.
+Strategy: {strategy}
+Context: {context}
+Keep it under 150 words."""
+
+_OBJECTION_TMPL = """\
+Lead Objected: "{objection}"
+Our Playbook says: "{kb_answer}"
+
+Draft a polite, persuasive response."""
+
+
 @tool("search_news")
 def search_news(company: str) -> str:
     """Searches for recent news about a company."""
@@ -29,9 +63,10 @@ class Researcher:
 
     async def research(self, lead):
         print(f"[Researcher] Analyzing {lead['company']}...")
-        news = await self.agent.run(
-            f"Find news about {lead['company']} to help with sales outreach."
-        )
+        async with _gemini_sem:
+            news = await self.agent.run(
+                f"Find news about {lead['company']} to help with sales outreach."
+            )
         self.db.log_interaction(lead["id"], f"Research: {news}")
         return news
 
@@ -48,18 +83,17 @@ class Strategist:
         query = f"{lead['industry']} {lead['role']} {lead.get('interests', '')}"
         context = self.db.get_context(query)
 
-        prompt = f"""
-        Lead: {lead["name"]}, {lead["role"]} at {lead["company"]}.
-        Industry: {lead["industry"]}
-        Interests: {lead.get("interests")}
-        Research: {research}
-        
-        Relevant Product Knowledge:
-        {context}
-        
-        Develop a sales angle. Output JSON: {{ "angle": "...", "key_value_props": [...] }}
-        """
-        response = await self.agent.run(prompt)
+        prompt = _STRATEGY_TMPL.format(
+            name=lead["name"],
+            role=lead["role"],
+            company=lead["company"],
+            industry=lead["industry"],
+            interests=lead.get("interests"),
+            research=research,
+            context=context,
+        )
+        async with _gemini_sem:
+            response = await self.agent.run(prompt)
         self.db.log_interaction(lead["id"], f"Strategy: {response}")
         return response, context
 
@@ -73,13 +107,11 @@ class OutreachSpecialist:
 
     async def draft(self, lead, strategy, context):
         print(f"[Outreach] Drafting email to {lead['name']}...")
-        prompt = f"""
-        Draft a cold email to {lead["name"]}.
-        Strategy: {strategy}
-        Context: {context}
-        Keep it under 150 words.
-        """
-        email = await self.agent.run(prompt)
+        prompt = _OUTREACH_TMPL.format(
+            name=lead["name"], strategy=strategy, context=context
+        )
+        async with _gemini_sem:
+            email = await self.agent.run(prompt)
         self.db.log_interaction(lead["id"], f"Draft: {email}")
         return email
 
@@ -94,12 +126,8 @@ class ObjectionHandler:
     async def handle(self, lead, objection):
         print(f"[ObjectionHandler] Handling: '{objection}'...")
         kb_answer = self.db.get_context(objection)
-        prompt = f"""
-        Lead Objected: "{objection}"
-        Our Playbook says: "{kb_answer}"
-        
-        Draft a polite, persuasive response.
-        """
-        response = await self.agent.run(prompt)
+        prompt = _OBJECTION_TMPL.format(objection=objection, kb_answer=kb_answer)
+        async with _gemini_sem:
+            response = await self.agent.run(prompt)
         self.db.log_interaction(lead["id"], f"Objection Response: {response}")
         return response
@@ -1,19 +1,120 @@
+import asyncio
 import contextlib
-import os
+import functools
+import hashlib
+import re
+from collections import OrderedDict, defaultdict
 
-from dotenv import load_dotenv
+import numpy as np
 from ricedb import RiceDBClient
 
-load_dotenv()
+from rice_agents._env import get_env
+from rice_agents.memory._embed_cache import CachedEmbeddingGenerator
+
+try:
+    from ricedb import SentenceTransformersEmbeddingGenerator
+except ImportError:
+    SentenceTransformersEmbeddingGenerator = None
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _node_id(s: str) -> int:
+    """
+    Stable 63-bit node ID for a string.
+
+    Python's hash() is salted per process, so hash-derived IDs change
+    between runs, and the old % 10000000 truncation hit birthday
+    collisions (silently overwriting logs) at a few hundred entries. A
+    BLAKE2b digest is reproducible and keeps nearly the full 64-bit range.
+    """
+    digest = hashlib.blake2b(s.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & ((1 << 63) - 1)
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_embedder():
+    """
+    Process-wide embedding generator. The sentence-transformers model is
+    hundreds of MB and takes seconds to load, so every RiceDBHandler (and
+    reconnect) shares one instance. It is wrapped in the process-global
+    embedding cache, so re-encoding the same query string — e.g. the
+    simulated "It sounds expensive." objection once per lead — is a dict
+    lookup instead of another forward pass. Returns None when the
+    embeddings extra is not installed.
+    """
+    if SentenceTransformersEmbeddingGenerator is None:
+        return None
+    try:
+        return CachedEmbeddingGenerator(SentenceTransformersEmbeddingGenerator())
+    except Exception:
+        return None
+
+
+class SemanticCache:
+    """
+    LRU cache for retrieved context keyed by query string.
+
+    Exact repeats (every lead raises the same "It sounds expensive."
+    objection) hit the dict directly. With an embedding generator, a
+    near-duplicate query also reuses the cached context when its cosine
+    similarity against a cached query clears `tau` — one local GEMV over
+    the stacked cached vectors instead of another server round trip.
+    """
+
+    def __init__(self, embedder=None, capacity: int = 512, tau: float = 0.92):
+        self.embedder = embedder
+        self.capacity = capacity
+        self.tau = tau
+        self._entries: OrderedDict = OrderedDict()  # query -> (vector, context)
+
+    def _embed(self, query):
+        try:
+            vec = np.asarray(
+                self.embedder.generate_embedding(query), dtype=np.float32
+            )
+        except Exception:
+            return None
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def get(self, query):
+        entry = self._entries.get(query)
+        if entry is not None:
+            self._entries.move_to_end(query)
+            return entry[1]
+
+        if self.embedder is None:
+            return None
+        keys = [k for k, (vec, _) in self._entries.items() if vec is not None]
+        if not keys:
+            return None
+        vec = self._embed(query)
+        if vec is None:
+            return None
+        sims = np.stack([self._entries[k][0] for k in keys]) @ vec
+        best = int(np.argmax(sims))
+        if sims[best] >= self.tau:
+            self._entries.move_to_end(keys[best])
+            return self._entries[keys[best]][1]
+        return None
+
+    def set(self, query, context):
+        vec = self._embed(query) if self.embedder else None
+        self._entries[query] = (vec, context)
+        self._entries.move_to_end(query)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
 
 
 class RiceDBHandler:
     def __init__(self):
         # Remote connection settings from environment
-        HOST = os.environ.get("RICEDB_HOST", "localhost")
-        PORT = int(os.environ.get("RICEDB_PORT", "80"))
-        PASSWORD = os.environ.get("RICEDB_PASSWORD", "password123")
-        SSL = os.environ.get("RICEDB_SSL", "false").lower() == "true"
+        HOST = get_env().get("RICEDB_HOST", "localhost")
+        PORT = int(get_env().get("RICEDB_PORT", "80"))
+        PASSWORD = get_env().get("RICEDB_PASSWORD", "password123")
+        SSL = get_env().get("RICEDB_SSL", "false").lower() == "true"
 
         # Initialize client (auto-detects transport)
         self.client = RiceDBClient(HOST, port=PORT)
@@ -29,31 +130,162 @@ class RiceDBHandler:
 
         self.user_id = 15
 
+        self.embedder = _shared_embedder()
+        self._context_cache = SemanticCache(self.embedder)
+
+        # Background log writer (started lazily on the first log call
+        # made under a running event loop; see log_interaction).
+        self._log_q = None
+        self._log_task = None
+
+        # Keyword fast path over the ingested KB (see ingest_kb)
+        self._kb_chunks = []
+        self._tok_idx = {}
+
     def ingest_kb(self, text):
         print("Ingesting Knowledge Base...")
         chunks = [line for line in text.split("\n") if line.strip()]
+
+        # Tiny inverted index (token -> chunk indices) so short queries
+        # whose every token appears in the KB can be answered locally in
+        # get_context without a vector search.
+        self._kb_chunks = chunks
+        self._tok_idx = defaultdict(set)
         for i, chunk in enumerate(chunks):
-            self.client.insert(
-                node_id=20000 + i,
-                text=chunk,
-                metadata={"type": "kb", "text": chunk},
-                user_id=self.user_id,
-            )
+            for tok in _TOKEN_RE.findall(chunk.lower()):
+                self._tok_idx[tok].add(i)
+        batch = [
+            {
+                "id": 20000 + i,
+                "text": chunk,
+                "metadata": {"type": "kb", "text": chunk},
+            }
+            for i, chunk in enumerate(chunks)
+        ]
+        # When the sentence-transformers extra is installed, embed all
+        # chunks in one padded forward pass and ship the precomputed
+        # vectors, instead of the server encoding each document on its own.
+        if self.embedder is not None:
+            with contextlib.suppress(Exception):
+                generate_batch = getattr(self.embedder, "generate_embeddings", None)
+                if generate_batch:
+                    vectors = generate_batch(chunks)
+                else:
+                    vectors = [self.embedder.generate_embedding(c) for c in chunks]
+                for doc, vec in zip(batch, vectors, strict=True):
+                    doc["vector"] = vec
+        # One round trip per 100 chunks instead of one per line: amortizes
+        # request framing and server-side index flushes across the batch.
+        batch_insert = getattr(self.client, "batch_insert", None)
+        if batch_insert:
+            for j in range(0, len(batch), 100):
+                batch_insert(batch[j : j + 100], user_id=self.user_id)
+        else:
+            for doc in batch:
+                self.client.insert(
+                    node_id=doc["id"],
+                    text=doc["text"],
+                    metadata=doc["metadata"],
+                    user_id=self.user_id,
+                )
 
     def get_context(self, query):
-        results = self.client.search(query=query, k=3, user_id=self.user_id)
-        return "\n".join(
-            [
-                r["metadata"].get("text", "")
-                for r in results
-                if r.get("metadata", {}).get("type") == "kb"
-            ]
-        )
+        cached = self._context_cache.get(query)
+        if cached is not None:
+            return cached
+
+        # Keyword fast path: when every query token has KB postings and
+        # their intersection is small enough to be precise (<= k), join
+        # those chunks directly and skip the vector search round trip.
+        toks = _TOKEN_RE.findall(query.lower())
+        if toks and self._tok_idx:
+            postings = [self._tok_idx.get(t) for t in toks]
+            if all(postings):
+                doc_ids = set.intersection(*postings)
+                if 0 < len(doc_ids) <= 3:
+                    context = "\n".join(self._kb_chunks[i] for i in sorted(doc_ids))
+                    self._context_cache.set(query, context)
+                    return context
+
+        try:
+            # Server-side metadata filter: only kb rows cross the network.
+            results = self.client.search(
+                query=query, k=3, user_id=self.user_id, metadata_filter={"type": "kb"}
+            )
+        except TypeError:
+            # Older clients without the filter kwarg: fetch and filter here.
+            results = self.client.search(query=query, k=3, user_id=self.user_id)
+            results = (r for r in results if r.get("metadata", {}).get("type") == "kb")
+        # ingest_kb always stamps metadata["text"], so no defensive .get
+        context = "\n".join(r["metadata"]["text"] for r in results)
+        self._context_cache.set(query, context)
+        return context
 
     def log_interaction(self, lead_id, content):
+        # Telemetry should not block an agent mid-conversation on a DB
+        # round trip. Under a running event loop the entry is queued and a
+        # background task coalesces pending entries into one batch_insert;
+        # outside a loop (scripted use) the write stays synchronous.
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._insert_interaction(lead_id, content)
+            return
+
+        if self._log_task is None or self._log_task.done():
+            self._log_q = asyncio.Queue()
+            self._log_task = asyncio.create_task(self._flush_logs())
+        self._log_q.put_nowait((lead_id, content))
+
+    async def _flush_logs(self):
+        """Drain the log queue in ~50ms windows, one batch_insert each."""
+        while True:
+            item = await self._log_q.get()
+            closing = item is None
+            batch = []
+            if not closing:
+                batch.append(item)
+                await asyncio.sleep(0.05)
+            while not self._log_q.empty() and len(batch) < 128:
+                item = self._log_q.get_nowait()
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            if batch:
+                await asyncio.to_thread(self.log_interactions_bulk, batch)
+            if closing:
+                return
+
+    async def drain_logs(self):
+        """Flush queued interaction logs and stop the writer task."""
+        if self._log_task is None or self._log_task.done():
+            return
+        self._log_q.put_nowait(None)
+        await self._log_task
+        self._log_task = None
+
+    def _insert_interaction(self, lead_id, content):
         self.client.insert(
-            node_id=abs(hash(content)) % 10000000,
+            node_id=_node_id(content),
             text=content,
             metadata={"type": "interaction", "lead_id": lead_id, "text": content},
             user_id=self.user_id,
         )
+
+    def log_interactions_bulk(self, interactions):
+        """Log many (lead_id, content) pairs in one batch_insert call."""
+        batch = [
+            {
+                "id": _node_id(content),
+                "text": content,
+                "metadata": {"type": "interaction", "lead_id": lead_id, "text": content},
+            }
+            for lead_id, content in interactions
+        ]
+        batch_insert = getattr(self.client, "batch_insert", None)
+        if batch_insert:
+            batch_insert(batch, user_id=self.user_id)
+        else:
+            for lead_id, content in interactions:
+                self._insert_interaction(lead_id, content)
@@ -1,11 +1,46 @@
-import os
-import json
 import asyncio
-from dotenv import load_dotenv
+import json
+import os
+
+from agents import ObjectionHandler, OutreachSpecialist, Researcher, Strategist
 from db import RiceDBHandler
-from agents import Researcher, Strategist, OutreachSpecialist, ObjectionHandler
 
-load_dotenv()
+from rice_agents._runner import run
+
+MAX_CONCURRENT_LEADS = 8
+
+
+async def process_lead(lead, db, sem):
+    """Run the research -> strategy -> draft -> objection chain for one lead.
+
+    Each lead gets its own agent instances: Agent keeps conversation
+    history, so sharing one across concurrent leads would interleave
+    their messages.
+    """
+    async with sem:
+        print(f"\n--- Processing Lead: {lead['name']} ---")
+
+        # Step A: Research
+        # Uses tool to find news
+        news = await Researcher(db).research(lead)
+        print(f"   > Research Found: {news[:60]}...")
+
+        # Step B: Strategy
+        # Uses RAG (product info) + Research to decide angle
+        strategy, context = await Strategist(db).plan(lead, news)
+        print("   > Strategy Formulated.")
+
+        # Step C: Outreach
+        # Drafts email
+        email = await OutreachSpecialist(db).draft(lead, strategy, context)
+        print(f"   > Email Draft:\n{email}\n")
+
+        # Step D: Simulation - Objection
+        # Simulates a common objection to see how agent uses KB to handle it
+        objection = "It sounds expensive."
+        print(f"   [Simulation] Lead replies: '{objection}'")
+        reply = await ObjectionHandler(db).handle(lead, objection)
+        print(f"   > Handling Response:\n{reply}\n")
 
 
 async def run_sdr_campaign():
@@ -19,7 +54,7 @@ async def run_sdr_campaign():
 
     # 2. Ingest Product KB
     if os.path.exists("product_kb.txt"):
-        with open("product_kb.txt", "r") as f:
+        with open("product_kb.txt") as f:
             kb_text = f.read()
         db.ingest_kb(kb_text)
     else:
@@ -27,44 +62,27 @@ async def run_sdr_campaign():
 
     # 3. Load Leads
     if os.path.exists("leads.json"):
-        with open("leads.json", "r") as f:
+        with open("leads.json") as f:
             leads = json.load(f)
     else:
         print("Warning: leads.json not found.")
         leads = []
 
-    # 4. Agents
-    researcher = Researcher(db)
-    strategist = Strategist(db)
-    outreach = OutreachSpecialist(db)
-    handler = ObjectionHandler(db)
-
-    # 5. Process Leads
-    for lead in leads:
-        print(f"\n--- Processing Lead: {lead['name']} ---")
-
-        # Step A: Research
-        # Uses tool to find news
-        news = await researcher.research(lead)
-        print(f"   > Research Found: {news[:60]}...")
-
-        # Step B: Strategy
-        # Uses RAG (product info) + Research to decide angle
-        strategy, context = await strategist.plan(lead, news)
-        print(f"   > Strategy Formulated.")
-
-        # Step C: Outreach
-        # Drafts email
-        email = await outreach.draft(lead, strategy, context)
-        print(f"   > Email Draft:\n{email}\n")
+    # 4. Process Leads concurrently. The chain is serial per lead, but
+    # leads are independent, so their LLM round trips overlap; the
+    # semaphore caps in-flight leads to stay under API rate limits.
+    sem = asyncio.Semaphore(MAX_CONCURRENT_LEADS)
+    results = await asyncio.gather(
+        *(process_lead(lead, db, sem) for lead in leads),
+        return_exceptions=True,
+    )
+    for lead, result in zip(leads, results, strict=True):
+        if isinstance(result, Exception):
+            print(f"Lead {lead['name']} failed: {result}")
 
-        # Step D: Simulation - Objection
-        # Simulates a common objection to see how agent uses KB to handle it
-        objection = "It sounds expensive."
-        print(f"   [Simulation] Lead replies: '{objection}'")
-        reply = await handler.handle(lead, objection)
-        print(f"   > Handling Response:\n{reply}\n")
+    # Flush any interaction logs still queued in the background writer
+    await db.drain_logs()
 
 
 if __name__ == "__main__":
-    asyncio.run(run_sdr_campaign())
+    run(run_sdr_campaign())
@@ -6,23 +6,22 @@ This example demonstrates how an Agent can safely experiment with changes
 in an isolated session (Fork) without affecting the global Base state.
 """
 
-import os
-import asyncio
-from dotenv import load_dotenv
+
 from ricedb import RiceDBClient
+
+from rice_agents._env import get_env
+from rice_agents._runner import run
 from rice_agents.agents.base import Agent
 from rice_agents.llms.gemini_provider import GeminiProvider
 
-load_dotenv()
-
-HOST = os.environ.get("RICEDB_HOST", "localhost")
-PORT = int(os.environ.get("RICEDB_PORT", "50051"))
-PASSWORD = os.environ.get("RICEDB_PASSWORD", "admin")
-SSL = os.environ.get("RICEDB_SSL", "false").lower() == "true"
+HOST = get_env().get("RICEDB_HOST", "localhost")
+PORT = int(get_env().get("RICEDB_PORT", "50051"))
+PASSWORD = get_env().get("RICEDB_PASSWORD", "admin")
+SSL = get_env().get("RICEDB_SSL", "false").lower() == "true"
 
 
 def get_llm():
-    api_key = os.getenv("GOOGLE_API_KEY")
+    api_key = get_env().get("GOOGLE_API_KEY")
     return GeminiProvider(model="gemini-3-flash-preview", api_key=api_key)
 
 
@@ -115,4 +114,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
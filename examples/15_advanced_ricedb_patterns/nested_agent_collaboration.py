@@ -6,17 +6,14 @@ This example demonstrates hierarchical memory management where a 'Worker' agent
 operates in a child session of a 'Supervisor' agent.
 """
 
-import os
-import asyncio
-from dotenv import load_dotenv
 from ricedb import RiceDBClient
 
-load_dotenv()
+from rice_agents._env import get_env
 
-HOST = os.environ.get("RICEDB_HOST", "localhost")
-PORT = int(os.environ.get("RICEDB_PORT", "50051"))
-PASSWORD = os.environ.get("RICEDB_PASSWORD", "admin")
-SSL = os.environ.get("RICEDB_SSL", "false").lower() == "true"
+HOST = get_env().get("RICEDB_HOST", "localhost")
+PORT = int(get_env().get("RICEDB_PORT", "50051"))
+PASSWORD = get_env().get("RICEDB_PASSWORD", "admin")
+SSL = get_env().get("RICEDB_SSL", "false").lower() == "true"
 
 
 def main():
@@ -0,0 +1,18 @@
+import os
+import types
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@lru_cache(maxsize=1)
+def get_env() -> types.MappingProxyType:
+    """
+    Load .env exactly once per process and return a read-only view of the
+    resulting environment.
+
+    Examples that run (or are chained) in the same process skip the repeated
+    stat + open + parse of the .env file on every entry point.
+    """
+    load_dotenv()
+    return types.MappingProxyType(dict(os.environ))
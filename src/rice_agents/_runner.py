@@ -0,0 +1,22 @@
+import asyncio
+import sys
+from collections.abc import Coroutine
+from typing import Any
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    asyncio.run with uvloop installed when available.
+
+    uvloop's libuv-based event loop gives a sizable throughput boost for
+    async-HTTP heavy workloads (e.g. large agent swarms); scripts fall
+    back to the stdlib loop on Windows or when uvloop is not installed.
+    """
+    if uvloop is not None and sys.platform != "win32":
+        uvloop.install()
+    return asyncio.run(coro)
@@ -1,5 +1,7 @@
+import asyncio
 import inspect
 import uuid
+from collections import deque
 from typing import TYPE_CHECKING, Any, Optional
 
 from ..llms.base import LLMProvider, ToolCall
@@ -9,6 +11,42 @@ from ..tools.base import RiceTool
 if TYPE_CHECKING:
     from ..containers.base import Container
 
+# Hard cap on a single tool result fed back to the LLM. Streamed results
+# stop draining once they hit it, so a tool reading an MB-scale file never
+# materializes the whole payload in history (or the next prompt).
+MAX_TOOL_RESULT_CHARS = 32_000
+_TRUNCATION_MARKER = "... [truncated]"
+
+
+def _drain_stream(chunks) -> str:
+    """Consume a streaming tool's chunks up to MAX_TOOL_RESULT_CHARS."""
+    pieces = []
+    total = 0
+    for chunk in chunks:
+        text = str(chunk)
+        if total + len(text) >= MAX_TOOL_RESULT_CHARS:
+            pieces.append(text[: MAX_TOOL_RESULT_CHARS - total])
+            pieces.append(_TRUNCATION_MARKER)
+            break
+        pieces.append(text)
+        total += len(text)
+    return "".join(pieces)
+
+
+async def _drain_async_stream(chunks) -> str:
+    """Async-generator counterpart of _drain_stream; stops at the cap."""
+    pieces = []
+    total = 0
+    async for chunk in chunks:
+        text = str(chunk)
+        if total + len(text) >= MAX_TOOL_RESULT_CHARS:
+            pieces.append(text[: MAX_TOOL_RESULT_CHARS - total])
+            pieces.append(_TRUNCATION_MARKER)
+            break
+        pieces.append(text)
+        total += len(text)
+    return "".join(pieces)
+
 
 class Agent:
     """
@@ -24,13 +62,18 @@ class Agent:
         system_prompt: str = "You are a helpful assistant.",
         session_id: str | None = None,
         container: Optional["Container"] = None,
+        max_history: int | None = 64,
     ):
         self.name = name
         self.llm = llm
         self.tools = tools or []
         self.memory = memory
         self.system_prompt = system_prompt
-        self.history: list[dict[str, Any]] = []
+        # Bounded: without a cap, long-running agents re-send an
+        # ever-growing message list to the provider every turn (O(turns^2)
+        # serialized bytes overall). None disables trimming.
+        self.max_history = max_history
+        self.history: deque[dict[str, Any]] = deque()
         self.tool_map = {t.name: t for t in self.tools}
         self.session_id = session_id or str(uuid.uuid4())
         self.container = container
@@ -45,17 +88,36 @@ class Agent:
         if self.container:
             self.container.register_agent(self)
 
+    def _trim_history(self) -> None:
+        """
+        Drop the oldest messages beyond max_history before a chat call.
+
+        The window is then re-aligned to start on a user message, so a
+        trimmed payload never opens with a dangling tool result or an
+        assistant turn whose context is gone.
+        """
+        if self.max_history is None:
+            return
+        while len(self.history) > self.max_history:
+            self.history.popleft()
+        while self.history and self.history[0]["role"] != "user":
+            self.history.popleft()
+
     async def run(self, task: str) -> str:
         """
         Executes the agent on a given task.
         """
         # RAG Retrieval
+        # Memory calls are blocking network I/O, so they run in worker
+        # threads; concurrent agents sharing one store overlap their calls
+        # instead of serializing on the event loop.
         context = ""
         if self.memory:
             # Scratchpad: Log task start
             add_scratchpad = getattr(self.memory, "add_scratchpad", None)
             if add_scratchpad:
-                add_scratchpad(
+                await asyncio.to_thread(
+                    add_scratchpad,
                     session_id=self.session_id,
                     agent=self.name,
                     content=f"Started task: {task}",
@@ -63,7 +125,9 @@ class Agent:
                 )
 
             try:
-                results = self.memory.query(task, n_results=3)
+                results = await asyncio.to_thread(
+                    self.memory.query, task, n_results=3
+                )
                 if results:
                     context = (
                         "\n[RELEVANT MEMORY]\n"
@@ -83,6 +147,7 @@ class Agent:
         while current_turn < max_turns:
             current_turn += 1
 
+            self._trim_history()
             response = await self.llm.chat(
                 messages=self.history,
                 tools=self.tools,
@@ -109,7 +174,8 @@ class Agent:
                     # Scratchpad: Log tool call
                     add_scratchpad = getattr(self.memory, "add_scratchpad", None)
                     if self.memory and add_scratchpad:
-                        add_scratchpad(
+                        await asyncio.to_thread(
+                            add_scratchpad,
                             session_id=self.session_id,
                             agent=self.name,
                             content=f"Calling tool: {tool_call.name}",
@@ -143,24 +209,64 @@ class Agent:
                     final_content = response.content
 
                 if self.container:
-                    self.container.on_agent_finish(self, task, final_content)
+                    await asyncio.to_thread(
+                        self.container.on_agent_finish, self, task, final_content
+                    )
 
                 return final_content
 
         msg = "Max turns reached."
         if self.container:
-            self.container.on_agent_finish(self, task, msg)
+            await asyncio.to_thread(self.container.on_agent_finish, self, task, msg)
         return msg
 
+    async def run_stream(self, task: str):
+        """
+        Executes the agent on a task, yielding response text chunks as the
+        LLM produces them.
+
+        Tool calls are not supported on this path; when the provider has no
+        chat_stream, the full run() result is yielded as a single chunk so
+        callers can always iterate.
+        """
+        chat_stream = getattr(self.llm, "chat_stream", None)
+        if chat_stream is None or self.tools:
+            yield await self.run(task)
+            return
+
+        self.history.append({"role": "user", "content": task})
+        self._trim_history()
+        pieces = []
+        async for chunk in chat_stream(
+            messages=self.history, system_prompt=self.system_prompt
+        ):
+            pieces.append(chunk)
+            yield chunk
+
+        final_content = "".join(pieces)
+        self.history.append({"role": "assistant", "content": final_content})
+        if self.container:
+            await asyncio.to_thread(
+                self.container.on_agent_finish, self, task, final_content
+            )
+
     async def _execute_tool(self, tool_call: ToolCall) -> Any:
         tool = self.tool_map.get(tool_call.name)
         if not tool:
             return f"Error: Tool {tool_call.name} not found."
 
         try:
+            if inspect.isasyncgenfunction(tool.func):
+                return await _drain_async_stream(tool(**tool_call.args))
             if inspect.iscoroutinefunction(tool.func):
                 return await tool(**tool_call.args)
-            else:
-                return tool(**tool_call.args)
+            if tool.streaming:
+                # Drain in a worker thread: each chunk read is blocking I/O
+                return await asyncio.to_thread(
+                    lambda: _drain_stream(tool(**tool_call.args))
+                )
+            # Run blocking tools (file I/O, sync HTTP, ...) in a worker
+            # thread so they don't stall every other agent on the loop.
+            return await asyncio.to_thread(tool, **tool_call.args)
         except Exception as e:
             return f"Error executing {tool_call.name}: {str(e)}"
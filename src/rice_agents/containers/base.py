@@ -97,6 +97,18 @@ class Container:
             except Exception as e:
                 logger.error(f"Container '{self.name}': Error auto-adding memory: {e}")
 
+    def close(self):
+        """
+        Release container resources at end-of-run.
+        Flushes any buffered scratchpad writes in the memory store.
+        """
+        flush = getattr(self.memory_store, "flush_scratchpad", None)
+        if flush:
+            try:
+                flush()
+            except Exception as e:
+                logger.error(f"Container '{self.name}': Error flushing scratchpad: {e}")
+
 
 _default_container: Optional[Container] = None
 
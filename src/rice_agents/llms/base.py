@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any
 
@@ -51,3 +52,23 @@ class LLMProvider(ABC):
             RiceLLMResponse: Standardized response object.
         """
         pass
+
+    async def abatch_generate(self, prompts: list[str]) -> list[str]:
+        """
+        Send many independent prompts concurrently and collect their responses.
+
+        All requests are submitted first, then gathered, so N I/O-bound LLM
+        calls complete in roughly the time of the slowest one instead of
+        running back-to-back.
+
+        Args:
+            prompts: List of plain-text prompts, one request each.
+
+        Returns:
+            List of response texts, in the same order as the prompts.
+        """
+        tasks = [
+            self.chat(messages=[{"role": "user", "content": p}]) for p in prompts
+        ]
+        responses = await asyncio.gather(*tasks)
+        return [r.content or "" for r in responses]
@@ -7,16 +7,107 @@ from google.genai import types
 from ..tools.base import RiceTool
 from .base import LLMProvider, RiceLLMResponse, ToolCall
 
+# One genai.Client per API key, shared across provider instances. The client
+# owns the HTTP connection pool, so examples that build a provider per agent
+# reuse keepalive connections instead of paying a TLS handshake per agent.
+_client_cache: dict[str, genai.Client] = {}
+
+
+def _get_client(api_key: str | None) -> genai.Client:
+    cache_key = api_key or ""
+    client = _client_cache.get(cache_key)
+    if client is None:
+        client = genai.Client(api_key=api_key)
+        _client_cache[cache_key] = client
+    return client
+
 
 class GeminiProvider(LLMProvider):
-    """Google Gemini implementation of LLMProvider using google-genai SDK."""
+    """
+    Google Gemini implementation of LLMProvider using google-genai SDK.
+
+    Requests go through the SDK's native async client (`client.aio`), so
+    calls never block the event loop and concurrency is not capped by the
+    default thread-pool size when many agents run at once.
+    """
 
     def __init__(
         self, model: str = "gemini-1.5-flash", api_key: str | None = None, **kwargs
     ):
         api_key = api_key or os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
         super().__init__(model, api_key, **kwargs)  # ty:ignore[invalid-argument-type]
-        self.client = genai.Client(api_key=self.api_key)
+        self.client = _get_client(self.api_key)
+        # Last rendered request config, keyed by (tools, system_prompt).
+        # Agents pass the same pair on every turn, so repeat calls skip
+        # rebuilding the Tool declarations and GenerateContentConfig.
+        self._request_config_key: tuple | None = None
+        self._request_config: types.GenerateContentConfig | None = None
+        # Server-side context cache handle (see acache_system_prompt)
+        self._cached_content_name: str | None = None
+        self._cached_system_prompt: str | None = None
+
+    async def acache_system_prompt(self, system_prompt: str, ttl: str = "600s") -> bool:
+        """
+        Create a Gemini server-side context cache for a system prompt that is
+        reused across many calls (e.g. an orchestrator's routing prompt).
+        Subsequent chat() calls with the same prompt pass cached_content
+        instead of re-sending and re-encoding the prefix tokens.
+
+        Returns True if the cache was created; False if caching is
+        unsupported for this model (callers fall back to the normal path).
+        """
+        try:
+            cache = await self.client.aio.caches.create(
+                model=self.model,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=system_prompt, ttl=ttl
+                ),
+            )
+        except Exception:
+            self._cached_content_name = None
+            self._cached_system_prompt = None
+            return False
+
+        self._cached_content_name = cache.name
+        self._cached_system_prompt = system_prompt
+        # Invalidate the rendered-config memo so chat() picks up the cache
+        self._request_config_key = None
+        return True
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        system_prompt: str | None = None,
+    ):
+        """
+        Stream a text response chunk by chunk.
+
+        Yields text fragments as the model produces them, letting callers
+        overlap downstream work (parsing, DB writes) with token
+        generation instead of blocking on the full response. Tool calling
+        is not supported on the stream path — use chat() for tool turns.
+        """
+        config = types.GenerateContentConfig(
+            system_instruction=system_prompt,
+            **{
+                k: v
+                for k, v in self.config.items()
+                if k not in ["tools", "system_instruction"]
+            },
+        )
+        contents = [
+            types.Content(
+                role="model" if m["role"] == "assistant" else "user",
+                parts=[types.Part(text=str(m.get("content") or ""))],
+            )
+            for m in messages
+        ]
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model, contents=contents, config=config
+        )
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
 
     async def chat(
         self,
@@ -24,21 +115,41 @@ class GeminiProvider(LLMProvider):
         tools: list[RiceTool] | None = None,
         system_prompt: str | None = None,
     ) -> RiceLLMResponse:
-        # 1. Prepare Tools
-        gemini_tools = None
-        if tools:
-            tool_declarations = [t.gemini_schema for t in tools]
-            gemini_tools = [types.Tool(function_declarations=tool_declarations)]  # ty:ignore[invalid-argument-type]
-
-        # 2. Prepare Config
-        config_args = {
-            k: v
-            for k, v in self.config.items()
-            if k not in ["tools", "system_instruction"]
-        }
-        config = types.GenerateContentConfig(
-            system_instruction=system_prompt, tools=gemini_tools, **config_args
+        # 1. & 2. Prepare Tools + Config (cached across calls). The key
+        # holds the tool objects themselves (not their ids) so a stale
+        # entry can never match a new tool that reused a freed id.
+        cache_key = (
+            tuple(tools) if tools else (),
+            system_prompt,
         )
+        if cache_key == self._request_config_key:
+            config = self._request_config
+        else:
+            gemini_tools = None
+            if tools:
+                tool_declarations = [t.gemini_schema for t in tools]
+                gemini_tools = [types.Tool(function_declarations=tool_declarations)]  # ty:ignore[invalid-argument-type]
+
+            config_args = {
+                k: v
+                for k, v in self.config.items()
+                if k not in ["tools", "system_instruction"]
+            }
+            if (
+                system_prompt
+                and system_prompt == self._cached_system_prompt
+                and not gemini_tools
+            ):
+                # Prompt prefix lives server-side; send only the handle
+                config = types.GenerateContentConfig(
+                    cached_content=self._cached_content_name, **config_args
+                )
+            else:
+                config = types.GenerateContentConfig(
+                    system_instruction=system_prompt, tools=gemini_tools, **config_args
+                )
+            self._request_config_key = cache_key
+            self._request_config = config
 
         # 3. Prepare Contents
         gemini_contents = []
@@ -104,9 +215,29 @@ class GeminiProvider(LLMProvider):
                 gemini_contents.append(types.Content(role="tool", parts=parts))
 
         # 4. Generate Content
-        response = await self.client.aio.models.generate_content(
-            model=self.model, contents=gemini_contents, config=config
-        )
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model, contents=gemini_contents, config=config
+            )
+        except Exception:
+            if not getattr(config, "cached_content", None):
+                raise
+            # The server-side cache handle has a TTL and can expire between
+            # calls; drop it and retry once with the inline system prompt.
+            self._cached_content_name = None
+            self._cached_system_prompt = None
+            self._request_config_key = None
+            config = types.GenerateContentConfig(
+                system_instruction=system_prompt,
+                **{
+                    k: v
+                    for k, v in self.config.items()
+                    if k not in ["tools", "system_instruction"]
+                },
+            )
+            response = await self.client.aio.models.generate_content(
+                model=self.model, contents=gemini_contents, config=config
+            )
 
         # 5. Parse Response
         content_text = None
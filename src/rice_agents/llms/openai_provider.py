@@ -15,6 +15,9 @@ class OpenAIProvider(LLMProvider):
         api_key = api_key or os.getenv("OPENAI_API_KEY")
         super().__init__(model, api_key, **kwargs)
         self.client = AsyncOpenAI(api_key=self.api_key)
+        # Cache of the rendered tools payload for repeat calls (see chat)
+        self._tools_key: tuple | None = None
+        self._tools_payload: list[dict] | None = None
 
     async def chat(
         self,
@@ -27,7 +30,16 @@ class OpenAIProvider(LLMProvider):
             final_messages.append({"role": "system", "content": system_prompt})
         final_messages.extend(messages)
 
-        openai_tools = [t.openai_schema for t in tools] if tools else None
+        # Agents pass the same tool list every turn; reuse the rendered
+        # payload. Keyed by the tool objects themselves — ids of dead
+        # objects can be reused, so id() keys are not stable.
+        tools_key = tuple(tools) if tools else ()
+        if tools_key == self._tools_key:
+            openai_tools = self._tools_payload
+        else:
+            openai_tools = [t.openai_schema for t in tools] if tools else None
+            self._tools_key = tools_key
+            self._tools_payload = openai_tools
 
         # Only pass tools param if tools are provided
         kwargs = self.config.copy()
@@ -1,5 +1,6 @@
 from .base import VectorStore
 from .ricedb_store import RiceDBStore
+from .sqlite_vec_store import SqliteVecStore
 from .vector_store import ChromaDBStore
 
-__all__ = ["VectorStore", "ChromaDBStore", "RiceDBStore"]
+__all__ = ["VectorStore", "ChromaDBStore", "RiceDBStore", "SqliteVecStore"]
@@ -0,0 +1,88 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class EmbeddingCache:
+    """
+    In-memory LRU cache for text embeddings, keyed by SHA-256 of the
+    model identifier and text.
+
+    Repeated queries (e.g. agents re-asking about the same topic, or reruns
+    over the same facts) become a dict lookup instead of another embedding
+    forward pass or HTTP round-trip. The cache is shared process-wide by
+    stores that may embed with different models, so `model` is part of the
+    key — without it two stores would serve each other wrong-dimension
+    vectors for the same text.
+    """
+
+    def __init__(self, capacity: int = 4096, ttl: float | None = None):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[float, Any]] = OrderedDict()
+
+    @staticmethod
+    def _key(text: str, model: str = "") -> bytes:
+        return hashlib.sha256(model.encode() + b"\x00" + text.encode()).digest()
+
+    def get(self, text: str, model: str = "") -> Any | None:
+        key = self._key(text, model)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, text: str, value: Any, model: str = "") -> None:
+        key = self._key(text, model)
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachedEmbeddingGenerator:
+    """
+    Wraps a RiceDB embedding generator with the shared EmbeddingCache.
+    All other attributes are delegated to the wrapped generator.
+    """
+
+    def __init__(self, generator: Any, cache: EmbeddingCache | None = None):
+        self._generator = generator
+        self._cache = cache or get_embedding_cache()
+        # Cache-key namespace for this generator's model, so generators
+        # wrapping different models never share entries.
+        model_name = getattr(generator, "model_name", None)
+        self._model_key = str(model_name) if model_name else type(generator).__name__
+
+    def generate_embedding(self, text: str) -> Any:
+        hit = self._cache.get(text, model=self._model_key)
+        if hit is not None:
+            return hit
+        value = self._generator.generate_embedding(text)
+        self._cache.set(text, value, model=self._model_key)
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._generator, name)
+
+
+# Process-global cache shared by all stores
+_global_cache = EmbeddingCache()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    return _global_cache
@@ -2,6 +2,7 @@ import logging
 import uuid
 from typing import Any
 
+from ._embed_cache import CachedEmbeddingGenerator
 from .base import VectorStore
 
 logger = logging.getLogger(__name__)
@@ -11,6 +12,11 @@ try:
 except ImportError:
     RiceDBClient: Any = None
 
+try:
+    from ricedb import SentenceTransformersEmbeddingGenerator
+except ImportError:
+    SentenceTransformersEmbeddingGenerator: Any = None
+
 
 class RiceDBStore(VectorStore):
     """
@@ -24,6 +30,8 @@ class RiceDBStore(VectorStore):
         user_id: int = 1,
         username: str | None = None,
         password: str | None = None,
+        buffer_scratchpad: bool = False,
+        scratchpad_flush_threshold: int = 128,
         **kwargs,
     ):
         if RiceDBClient is None:
@@ -47,18 +55,37 @@ class RiceDBStore(VectorStore):
                 logger.error(f"Failed to login to RiceDB: {e}")
 
         self.user_id = user_id
+        # Client-side embedding generator (from ricedb[embeddings]).
+        # Passed to insert_text/search_text so embeddings are computed locally
+        # and batched rather than per-request on the server.
+        self.embedding_generator = (
+            CachedEmbeddingGenerator(SentenceTransformersEmbeddingGenerator())
+            if SentenceTransformersEmbeddingGenerator
+            else None
+        )
+        # Opt-in write buffering for the scratchpad: large swarms emit
+        # hundreds of tiny entries per run, and buffering turns them into a
+        # handful of bulk requests. Off by default so entries remain
+        # immediately visible to other agents in the session.
+        self.buffer_scratchpad = buffer_scratchpad
+        self.scratchpad_flush_threshold = scratchpad_flush_threshold
+        self._scratch_buffer: list[dict[str, Any]] = []
 
     def add_texts(
         self,
         texts: list[str],
         metadatas: list[dict[str, Any]] | None = None,
         ids: list[str] | None = None,
+        batch_size: int = 64,
     ) -> None:
         """
         Add texts to RiceDB.
         Note: RiceDB typically uses integer node_ids.
         We will attempt to hash string IDs to integers if provided,
         or generate new integer IDs.
+
+        Multi-text adds are embedded per batch (one encoder forward pass)
+        and sent via `batch_insert`; single texts go through `insert_text`.
         """
         if not ids:
             ids = [str(uuid.uuid4()) for _ in texts]
@@ -66,35 +93,69 @@ class RiceDBStore(VectorStore):
         if metadatas is None:
             metadatas = [{} for _ in texts]
 
-        for i, text in enumerate(texts):
-            # Ensure text is stored in metadata for retrieval
-            if "text" not in metadatas[i]:
-                metadatas[i]["text"] = text
+        node_ids = []
+        for i in range(len(texts)):
             # RiceDB expects integer node_id.
             # We try to convert the ID to int if possible, otherwise hash it.
             try:
-                node_id = int(ids[i])
+                node_ids.append(int(ids[i]))
             except ValueError:
                 # Simple hash to get a positive integer
-                node_id = abs(hash(ids[i])) % (10**9)
+                node_ids.append(abs(hash(ids[i])) % (10**9))
+
+        if len(texts) > 1 and hasattr(self.client, "batch_insert"):
+            for start in range(0, len(texts), batch_size):
+                batch = texts[start : start + batch_size]
+                vectors = self._embed_batch(batch)
+                docs = []
+                for j, text in enumerate(batch):
+                    # Ensure text is stored in metadata for retrieval
+                    meta = dict(metadatas[start + j])
+                    meta.setdefault("text", text)
+                    docs.append(
+                        {
+                            "id": node_ids[start + j],
+                            "text": text,
+                            "vector": vectors[j],
+                            "metadata": meta,
+                        }
+                    )
+                try:
+                    self.client.batch_insert(docs, user_id=self.user_id)
+                except Exception as e:
+                    logger.error(f"Failed to batch insert into RiceDB: {e}")
+            return
 
+        for i, text in enumerate(texts):
             try:
-                self.client.insert(
-                    node_id=node_id,
+                self.client.insert_text(
+                    node_id=node_ids[i],
                     text=text,
                     metadata=metadatas[i],
+                    embedding_generator=self.embedding_generator,
                     user_id=self.user_id,
                 )
             except Exception as e:
                 logger.error(f"Failed to insert text into RiceDB: {e}")
 
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Embed a batch of texts, vectorizing in one call when supported."""
+        if not self.embedding_generator:
+            return [[] for _ in texts]
+
+        generate_batch = getattr(self.embedding_generator, "generate_embeddings", None)
+        if generate_batch:
+            return generate_batch(texts)
+        return [self.embedding_generator.generate_embedding(t) for t in texts]
+
     def query(self, query: str, n_results: int = 5) -> list[str]:
         """
         Query RiceDB for similar texts.
         """
         try:
-            results = self.client.search(
+            results = self.client.search_text(
                 query=query,
+                embedding_generator=self.embedding_generator,
                 user_id=self.user_id,
                 k=n_results,
             )
@@ -127,7 +188,25 @@ class RiceDBStore(VectorStore):
     ) -> None:
         """
         Add an entry to the agent scratchpad memory.
+
+        With `buffer_scratchpad` enabled, entries accumulate locally and are
+        sent in bulk once the buffer hits the flush threshold (or on an
+        explicit `flush_scratchpad()` / `Container.close()`).
         """
+        if self.buffer_scratchpad:
+            self._scratch_buffer.append(
+                {
+                    "session_id": session_id,
+                    "agent": agent,
+                    "content": content,
+                    "metadata": metadata,
+                    "ttl": ttl,
+                }
+            )
+            if len(self._scratch_buffer) >= self.scratchpad_flush_threshold:
+                self.flush_scratchpad()
+            return
+
         if hasattr(self.client, "memory"):
             try:
                 self.client.memory.add(
@@ -142,6 +221,49 @@ class RiceDBStore(VectorStore):
         else:
             logger.warning("RiceDB client does not support memory/scratchpad features.")
 
+    def add_scratchpad_batch(
+        self, session_id: str, entries: list[dict[str, Any]]
+    ) -> None:
+        """
+        Add many scratchpad entries for one session in a single bulk call.
+        Callers that emit several entries over a run (e.g. one per
+        simulation step) can accumulate them locally and pay one round
+        trip instead of one per entry.
+        """
+        self._send_scratchpad_entries(
+            [{"session_id": session_id, **entry} for entry in entries]
+        )
+
+    def flush_scratchpad(self) -> None:
+        """
+        Send all buffered scratchpad entries to RiceDB.
+        """
+        entries, self._scratch_buffer = self._scratch_buffer, []
+        self._send_scratchpad_entries(entries)
+
+    def _send_scratchpad_entries(self, entries: list[dict[str, Any]]) -> None:
+        """
+        Ship entries via the client's bulk endpoint when available,
+        falling back to per-entry adds otherwise.
+        """
+        if not entries:
+            return
+
+        memory = getattr(self.client, "memory", None)
+        if memory is None:
+            logger.warning("RiceDB client does not support memory/scratchpad features.")
+            return
+
+        batch_add = getattr(memory, "batch_add", None)
+        try:
+            if batch_add:
+                batch_add(entries)
+            else:
+                for entry in entries:
+                    memory.add(**entry)
+        except Exception as e:
+            logger.error(f"Failed to send scratchpad entries: {e}")
+
     def get_scratchpad(
         self, session_id: str, filter: dict[str, Any] | None = None
     ) -> list[dict[str, Any]]:
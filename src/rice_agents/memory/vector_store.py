@@ -1,32 +1,100 @@
+import functools
 import uuid
 from typing import Any
 
 import chromadb
 
+from ._embed_cache import get_embedding_cache
 from .base import VectorStore
 
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+@functools.lru_cache(maxsize=4)
+def _load_embedder(model_name: str):
+    """
+    Load a SentenceTransformer once per model name.
+    Every store instance with the same model shares one set of weights
+    (~90MB each), so swarms that build a store per agent pay for the
+    model load exactly once.
+    """
+    return SentenceTransformer(model_name)
+
 
 class ChromaDBStore(VectorStore):
     def __init__(
-        self, collection_name: str = "rice_agents_memory", path: str = "./chroma_db"
+        self,
+        collection_name: str = "rice_agents_memory",
+        path: str = "./chroma_db",
+        embedding_model: str = "all-MiniLM-L6-v2",
     ):
         self.client = chromadb.PersistentClient(path=path)
         # Using default embedding function (all-MiniLM-L6-v2) implicitly
         self.collection = self.client.get_or_create_collection(name=collection_name)
+        # If sentence-transformers is available, we embed locally in batches
+        # (one forward pass per batch) instead of letting Chroma embed
+        # item-by-item. Falls back to Chroma's own embedding path otherwise.
+        self.embedding_model = embedding_model
+        self.embedder = (
+            _load_embedder(embedding_model) if SentenceTransformer else None
+        )
 
     def add_texts(
         self,
         texts: list[str],
         metadatas: list[dict[str, Any]] | None = None,
         ids: list[str] | None = None,
+        batch_size: int = 64,
     ) -> None:
         if not ids:
             ids = [str(uuid.uuid4()) for _ in texts]
 
-        self.collection.add(documents=texts, metadatas=metadatas, ids=ids)
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start : start + batch_size]
+            batch_ids = ids[start : start + batch_size]
+            batch_metas = metadatas[start : start + batch_size] if metadatas else None
+
+            if self.embedder:
+                embeddings = self.embedder.encode(
+                    batch,
+                    batch_size=batch_size,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                )
+                self.collection.add(
+                    ids=batch_ids,
+                    embeddings=embeddings.tolist(),
+                    documents=batch,
+                    metadatas=batch_metas,
+                )
+            else:
+                self.collection.add(
+                    documents=batch, metadatas=batch_metas, ids=batch_ids
+                )
+
+    def embed_query(self, query: str) -> list[float]:
+        """Embed a query string, serving repeats from the shared cache."""
+        cache = get_embedding_cache()
+        cached = cache.get(query, model=self.embedding_model)
+        if cached is not None:
+            return cached
+
+        embedding = self.embedder.encode(
+            query, convert_to_numpy=True, normalize_embeddings=True
+        ).tolist()
+        cache.set(query, embedding, model=self.embedding_model)
+        return embedding
 
     def query(self, query: str, n_results: int = 5) -> list[str]:
-        results = self.collection.query(query_texts=[query], n_results=n_results)
+        if self.embedder:
+            results = self.collection.query(
+                query_embeddings=[self.embed_query(query)], n_results=n_results
+            )
+        else:
+            results = self.collection.query(query_texts=[query], n_results=n_results)
         if results and results["documents"]:
             return results["documents"][0]
         return []
@@ -15,6 +15,18 @@ class AdaptiveOrchestrator:
         self.manager_llm = manager_llm
         self.agents = agents
         self.agent_names = list(agents.keys())
+        # The planning prompt is identical for every routing decision, so
+        # it is built once and offered to the provider's context cache.
+        self._planner_system_prompt = (
+            "You are an expert project manager and orchestrator. "
+            "Your job is to break down the user's high-level goal into a logical sequence of execution steps. "
+            f"You have the following team of agents available: {', '.join(self.agent_names)}. "
+            "Assign each step to the most appropriate agent from this list. "
+            "Return the plan strictly as a valid JSON object. Do not include any conversational text. "
+            "The JSON structure must be:\n"
+            '{ "steps": [ { "id": 1, "description": "Detailed description of what needs to be done", "assigned_agent_name": "exact_agent_name_from_list" } ] }'
+        )
+        self._planner_cache_attempted = False
 
     async def run(self, goal: str) -> str:
         """
@@ -22,6 +34,15 @@ class AdaptiveOrchestrator:
         """
         # 1. Plan
         print(f"--- [Adaptive] Analyzing goal: '{goal}' ---")
+
+        # Offer the repeated planning prompt to the provider's server-side
+        # context cache (Gemini); providers without support are skipped.
+        if not self._planner_cache_attempted:
+            self._planner_cache_attempted = True
+            cache_prompt = getattr(self.manager_llm, "acache_system_prompt", None)
+            if cache_prompt:
+                await cache_prompt(self._planner_system_prompt)
+
         plan = await self._create_plan(goal)
 
         if not plan:
@@ -74,21 +95,11 @@ class AdaptiveOrchestrator:
         return final_result
 
     async def _create_plan(self, goal: str) -> list[dict[str, Any]]:
-        system_prompt = (
-            "You are an expert project manager and orchestrator. "
-            "Your job is to break down the user's high-level goal into a logical sequence of execution steps. "
-            f"You have the following team of agents available: {', '.join(self.agent_names)}. "
-            "Assign each step to the most appropriate agent from this list. "
-            "Return the plan strictly as a valid JSON object. Do not include any conversational text. "
-            "The JSON structure must be:\n"
-            '{ "steps": [ { "id": 1, "description": "Detailed description of what needs to be done", "assigned_agent_name": "exact_agent_name_from_list" } ] }'
-        )
-
         messages = [{"role": "user", "content": goal}]
 
         try:
             response = await self.manager_llm.chat(
-                messages, system_prompt=system_prompt
+                messages, system_prompt=self._planner_system_prompt
             )
             text = response.content
             if not text:
@@ -36,7 +36,11 @@ class ParallelFlow:
 
     async def run(self, task: str) -> list[str]:
         print(f"--- [{self.name}] Starting {len(self.agents)} agents ---")
+        # Submit all coroutines first, then collect; return_exceptions keeps
+        # one failing agent from cancelling its siblings mid-flight.
         tasks = [agent.run(task) for agent in self.agents]
-        results = await asyncio.gather(*tasks)
+        results = await asyncio.gather(*tasks, return_exceptions=True)
         print(f"--- [{self.name}] Finished ---")
-        return results
+        return [
+            f"Error: {r}" if isinstance(r, BaseException) else r for r in results
+        ]
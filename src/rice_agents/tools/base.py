@@ -1,6 +1,7 @@
 import inspect
 import typing
 from collections.abc import Callable
+from functools import cached_property
 from typing import Any, get_type_hints
 
 
@@ -15,10 +16,19 @@ class RiceTool:
         func: Callable,
         name: str | None = None,
         description: str | None = None,
+        streaming: bool = False,
     ):
         self.func = func
         self.name = name or func.__name__
         self.description = description or func.__doc__ or ""
+        # Streaming tools yield chunks instead of returning one string;
+        # the agent loop drains them under a size cap. Generator functions
+        # are detected automatically, the flag makes it explicit.
+        self.streaming = (
+            streaming
+            or inspect.isgeneratorfunction(func)
+            or inspect.isasyncgenfunction(func)
+        )
         self.signature = inspect.signature(func)
         self.type_hints = get_type_hints(func)
 
@@ -26,9 +36,13 @@ class RiceTool:
         """Execute the wrapped function."""
         return self.func(*args, **kwargs)
 
-    @property
+    @cached_property
     def openai_schema(self) -> dict[str, Any]:
-        """Generates OpenAI-compatible function schema."""
+        """
+        Generates OpenAI-compatible function schema.
+        Computed once per tool; every chat call afterwards is a plain
+        attribute lookup instead of repeated signature introspection.
+        """
         parameters = {"type": "object", "properties": {}, "required": []}
 
         for param_name, param in self.signature.parameters.items():
@@ -55,7 +69,7 @@ class RiceTool:
             },
         }
 
-    @property
+    @cached_property
     def gemini_schema(self) -> dict[str, Any]:
         """
         Generates Google Gemini compatible function declaration.
@@ -71,7 +85,7 @@ class RiceTool:
             "parameters": self.openai_schema["function"]["parameters"],
         }
 
-    @property
+    @cached_property
     def anthropic_schema(self) -> dict[str, Any]:
         """Generates Anthropic-compatible tool schema."""
         return {
@@ -97,10 +111,14 @@ class RiceTool:
         return "string"  # Default fallback
 
 
-def tool(name: str | None = None, description: str | None = None):
+def tool(
+    name: str | None = None,
+    description: str | None = None,
+    streaming: bool = False,
+):
     """Decorator to register a function as a RiceTool."""
 
     def decorator(func):
-        return RiceTool(func, name, description)
+        return RiceTool(func, name, description, streaming=streaming)
 
     return decorator
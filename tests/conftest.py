@@ -7,3 +7,11 @@ try:
 except ImportError:
     mock_chromadb = MagicMock()
     sys.modules["chromadb"] = mock_chromadb
+
+# Mock ricedb if not installed (must happen before rice_agents imports it)
+try:
+    import ricedb  # noqa: F401
+except ImportError:
+    mock_ricedb = MagicMock()
+    sys.modules["ricedb"] = mock_ricedb
+    sys.modules["ricedb.utils"] = MagicMock()
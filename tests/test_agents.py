@@ -2,7 +2,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from rice_agents.agents.base import Agent
+from rice_agents.agents.base import MAX_TOOL_RESULT_CHARS, Agent
 from rice_agents.llms.base import RiceLLMResponse, ToolCall
 from rice_agents.tools.base import tool
 
@@ -12,6 +12,12 @@ def get_test_value() -> str:
     return "tested"
 
 
+@tool("stream_chunks", streaming=True)
+def stream_chunks():
+    for _ in range(20):
+        yield "x" * 4096
+
+
 @pytest.mark.asyncio
 async def test_agent_run_basic():
     mock_llm = MagicMock()
@@ -28,6 +34,59 @@ async def test_agent_run_basic():
     assert len(agent.history) == 2  # User + Assistant
 
 
+@pytest.mark.asyncio
+async def test_agent_history_capped():
+    mock_llm = MagicMock()
+
+    async def mock_chat(*args, **kwargs):
+        return RiceLLMResponse(content="ok", provider="mock", model="mock")
+
+    mock_llm.chat.side_effect = mock_chat
+
+    agent = Agent("CappedBot", mock_llm, max_history=4)
+    for i in range(5):
+        await agent.run(f"task {i}")
+
+    # Window stays bounded and opens on a user message
+    assert len(agent.history) <= 4
+    assert agent.history[0]["role"] == "user"
+    assert agent.history[-1] == {"role": "assistant", "content": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_agent_run_stream():
+    mock_llm = MagicMock()
+
+    async def mock_chat_stream(messages, system_prompt=None):
+        for part in ("Hello ", "World"):
+            yield part
+
+    mock_llm.chat_stream = mock_chat_stream
+
+    agent = Agent("StreamBot", mock_llm)
+    chunks = [c async for c in agent.run_stream("Hi")]
+
+    assert chunks == ["Hello ", "World"]
+    # Full response lands in history once the stream is drained
+    assert agent.history[-1] == {"role": "assistant", "content": "Hello World"}
+
+
+@pytest.mark.asyncio
+async def test_agent_run_stream_falls_back_without_provider_support():
+    mock_llm = MagicMock()
+
+    async def mock_chat(*args, **kwargs):
+        return RiceLLMResponse(content="Hello World", provider="mock", model="mock")
+
+    mock_llm.chat.side_effect = mock_chat
+    del mock_llm.chat_stream  # provider without a streaming API
+
+    agent = Agent("FallbackBot", mock_llm)
+    chunks = [c async for c in agent.run_stream("Hi")]
+
+    assert chunks == ["Hello World"]
+
+
 @pytest.mark.asyncio
 async def test_agent_tool_calling():
     mock_llm = MagicMock()
@@ -55,3 +114,28 @@ async def test_agent_tool_calling():
     assert len(agent.history) == 4
     assert agent.history[2]["role"] == "tool"
     assert agent.history[2]["content"] == "tested"
+
+
+@pytest.mark.asyncio
+async def test_agent_streaming_tool_truncated():
+    mock_llm = MagicMock()
+
+    async def mock_chat_sequence(messages, **kwargs):
+        if len(messages) == 1:
+            return RiceLLMResponse(
+                provider="mock",
+                model="mock",
+                tool_calls=[ToolCall(name="stream_chunks", args={}, id="call_1")],
+            )
+        return RiceLLMResponse(content="done", provider="mock", model="mock")
+
+    mock_llm.chat.side_effect = mock_chat_sequence
+
+    agent = Agent("StreamBot", mock_llm, tools=[stream_chunks])
+    response = await agent.run("Stream it")
+
+    assert response == "done"
+    result = agent.history[2]["content"]
+    assert result.endswith("... [truncated]")
+    # 20 x 4KB chunks exceed the cap; the drained result must not
+    assert len(result) <= MAX_TOOL_RESULT_CHARS + len("... [truncated]")
@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock
+
+from rice_agents.memory._embed_cache import (
+    CachedEmbeddingGenerator,
+    EmbeddingCache,
+    get_embedding_cache,
+)
+
+
+def test_cache_hit_and_miss():
+    cache = EmbeddingCache(capacity=4)
+    assert cache.get("hello") is None
+
+    cache.set("hello", [0.1, 0.2])
+    assert cache.get("hello") == [0.1, 0.2]
+
+
+def test_cache_lru_eviction():
+    cache = EmbeddingCache(capacity=2)
+    cache.set("a", [1.0])
+    cache.set("b", [2.0])
+
+    # Touch "a" so "b" becomes least recently used
+    cache.get("a")
+    cache.set("c", [3.0])
+
+    assert cache.get("a") == [1.0]
+    assert cache.get("b") is None
+    assert cache.get("c") == [3.0]
+
+
+def test_cache_keys_include_model():
+    cache = EmbeddingCache(capacity=4)
+    cache.set("hello", [0.1], model="model-a")
+
+    # Same text under a different model must miss, not serve model-a's vector
+    assert cache.get("hello", model="model-b") is None
+    assert cache.get("hello", model="model-a") == [0.1]
+
+
+def test_cache_ttl_expiry():
+    import time
+
+    cache = EmbeddingCache(capacity=4, ttl=0.001)
+    cache.set("a", [1.0])
+    time.sleep(0.002)
+    assert cache.get("a") is None
+
+
+def test_cached_generator_avoids_recompute():
+    inner = MagicMock()
+    inner.generate_embedding.return_value = [0.5]
+
+    gen = CachedEmbeddingGenerator(inner, cache=EmbeddingCache(capacity=4))
+
+    assert gen.generate_embedding("query") == [0.5]
+    assert gen.generate_embedding("query") == [0.5]
+    inner.generate_embedding.assert_called_once_with("query")
+
+
+def test_global_cache_is_shared():
+    assert get_embedding_cache() is get_embedding_cache()
@@ -38,3 +38,24 @@ async def test_parallel_flow():
     assert len(results) == 2
     assert results[0] == "Input -> Out1"
     assert results[1] == "Input -> Out2"
+
+
+class FailingAgent:
+    def __init__(self, name):
+        self.name = name
+
+    async def run(self, task):
+        raise RuntimeError("boom")
+
+
+@pytest.mark.asyncio
+async def test_parallel_flow_isolates_failures():
+    a1 = MockAgent("A1", "Out1")
+    a2 = FailingAgent("A2")
+
+    flow = ParallelFlow([a1, a2])
+    results = await flow.run("Input")
+
+    # The healthy agent still completes; the failure becomes an error string
+    assert results[0] == "Input -> Out1"
+    assert results[1] == "Error: boom"
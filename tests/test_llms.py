@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from rice_agents.llms.base import LLMProvider, RiceLLMResponse
+
+
+class MockProvider(LLMProvider):
+    def __init__(self):
+        super().__init__(model="mock", api_key="test")
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def chat(self, messages, tools=None, system_prompt=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return RiceLLMResponse(
+            content=f"echo: {messages[-1]['content']}", provider="mock", model="mock"
+        )
+
+
+@pytest.mark.asyncio
+async def test_abatch_generate_preserves_order():
+    provider = MockProvider()
+    prompts = [f"prompt {i}" for i in range(5)]
+
+    results = await provider.abatch_generate(prompts)
+
+    assert results == [f"echo: prompt {i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_abatch_generate_runs_concurrently():
+    provider = MockProvider()
+
+    await provider.abatch_generate([f"prompt {i}" for i in range(5)])
+
+    # All requests should be in flight at once, not serialized
+    assert provider.max_in_flight == 5
@@ -73,6 +73,57 @@ def test_ricedb_scratchpad(mock_ricedb_client):
     )
 
 
+def test_ricedb_scratchpad_buffered(mock_ricedb_client):
+    store = RiceDBStore(buffer_scratchpad=True, scratchpad_flush_threshold=3)
+    mock_memory = MagicMock()
+    store.client.memory = mock_memory
+
+    store.add_scratchpad("sess1", "agent1", "one")
+    store.add_scratchpad("sess1", "agent1", "two")
+    # Below the threshold: nothing sent yet
+    mock_memory.add.assert_not_called()
+    mock_memory.batch_add.assert_not_called()
+
+    store.add_scratchpad("sess1", "agent1", "three")
+    # Threshold hit: one bulk call with all three entries
+    mock_memory.batch_add.assert_called_once()
+    assert len(mock_memory.batch_add.call_args.args[0]) == 3
+    assert store._scratch_buffer == []
+
+
+def test_ricedb_scratchpad_batch(mock_ricedb_client):
+    store = RiceDBStore()
+    mock_memory = MagicMock()
+    store.client.memory = mock_memory
+
+    store.add_scratchpad_batch(
+        "sess1",
+        [
+            {"agent": "agent1", "content": "one", "metadata": {"step": "0"}},
+            {"agent": "agent1", "content": "two", "metadata": {"step": "1"}},
+        ],
+    )
+
+    mock_memory.batch_add.assert_called_once()
+    entries = mock_memory.batch_add.call_args.args[0]
+    assert len(entries) == 2
+    assert all(e["session_id"] == "sess1" for e in entries)
+
+
+def test_ricedb_scratchpad_explicit_flush(mock_ricedb_client):
+    store = RiceDBStore(buffer_scratchpad=True)
+    mock_memory = MagicMock()
+    store.client.memory = mock_memory
+    # No bulk endpoint: flush falls back to per-entry adds
+    del mock_memory.batch_add
+
+    store.add_scratchpad("sess1", "agent1", "one")
+    store.add_scratchpad("sess1", "agent1", "two")
+    store.flush_scratchpad()
+
+    assert mock_memory.add.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_agent_with_ricedb_scratchpad(mock_ricedb_client):
     store = RiceDBStore()
@@ -38,6 +38,13 @@ def test_openai_schema_generation():
     assert "x" in schema["function"]["parameters"]["required"]
 
 
+def test_schema_is_cached():
+    t = RiceTool(simple_func)
+    # cached_property: repeated access returns the same object, no re-introspection
+    assert t.openai_schema is t.openai_schema
+    assert t.gemini_schema is t.gemini_schema
+
+
 def test_gemini_schema_generation():
     # decorated_func is already a RiceTool instance
     t = decorated_func